@@ -0,0 +1,93 @@
+"""
+Benchmarks for declaring variables
+"""
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from env_config import Config, WarmCache, parse_str
+
+from conftest import environment
+
+
+def declare_each(definitions, **kwargs):
+    config = Config(**kwargs)
+    for key, definition in definitions.items():
+        config.declare(key, definition)
+    return config
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_flat(benchmark, flat):
+    benchmark(declare_each, flat)
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_many_flat(benchmark, flat):
+    benchmark(Config.from_schema, flat)
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_nested(benchmark, nested):
+    benchmark(declare_each, nested)
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_many_nested(benchmark, nested):
+    benchmark(Config.from_schema, nested)
+
+
+@pytest.mark.benchmark(group='declare')
+def test_declare_lazy_flat(benchmark, flat):
+    benchmark(declare_each, flat, lazy=True)
+
+
+
+_URL = re.compile(r'^(https?)://([a-z0-9-]+\.)+[a-z]{2,}(:[0-9]+)?(/[^\s]*)?$')
+
+
+def expensive_validator(value):
+    for _ in range(50):
+        if not _URL.match(value):
+            raise ValueError('not a url')
+
+
+@pytest.fixture(scope='module')
+def urls():
+    definitions = {'bench_url_{}'.format(i): parse_str(validator=expensive_validator) for i in range(400)}
+    variables = {key.upper(): 'https://service{}.example.com:8080/path'.format(i)
+                 for i, key in enumerate(definitions)}
+    with environment(variables):
+        yield definitions
+
+
+@pytest.mark.benchmark(group='declare_expensive_validators')
+def test_declare_many_expensive_validators(benchmark, urls):
+    benchmark(Config.from_schema, urls)
+
+
+@pytest.mark.benchmark(group='declare_expensive_validators')
+def test_declare_many_expensive_validators_warm_cache(benchmark, urls, tmp_path):
+    filename = str(tmp_path / 'warm_cache.json')
+    Config.from_schema(urls, warm_cache=WarmCache(filename))
+    # a new WarmCache per round, like a new process
+    benchmark(lambda: Config.from_schema(urls, warm_cache=WarmCache(filename)))
+
+
+def blocking_validator(value):
+    # stands in for validators waiting on I/O, e.g. resolving host names
+    time.sleep(0.001)
+
+
+@pytest.mark.benchmark(group='declare_blocking_validators')
+@pytest.mark.parametrize('workers', [None, 8])
+def test_declare_many_blocking_validators(benchmark, urls, workers):
+    definitions = {key: parse_str(validator=blocking_validator) for key in list(urls)[:50]}
+    executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+    try:
+        benchmark(Config.from_schema, definitions, validation_executor=executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,67 @@
+"""
+Benchmarks for Config.get() and Config.values
+"""
+import pytest
+
+from env_config import AggregateConfigError, Config, ConfigMissingError, parse_str
+
+
+def raises(exception_type, function, *args):
+    try:
+        function(*args)
+    except exception_type:
+        return True
+    return False
+
+
+@pytest.mark.benchmark(group='get')
+def test_plain_dict_lookup(benchmark, flat):
+    values = {key: 1 for key in flat}
+    benchmark(values.__getitem__, 'bench_key_200')
+
+
+@pytest.mark.benchmark(group='get')
+def test_get(benchmark, flat):
+    config = Config.from_schema(flat)
+    assert benchmark(config.get, 'bench_key_200') == 42
+
+
+@pytest.mark.benchmark(group='get')
+def test_get_nested(benchmark, nested):
+    config = Config.from_schema(nested)
+    assert benchmark(config.get, 'bench_key_10')['value0'] == 42
+
+
+@pytest.mark.benchmark(group='get')
+def test_get_frozen(benchmark, flat):
+    config = Config.from_schema(flat)
+    config.freeze()
+    assert benchmark(config.get, 'bench_key_200') == 42
+
+
+@pytest.mark.benchmark(group='get')
+def test_get_frozen_namespaced(benchmark, flat):
+    config = Config(namespace='bench')
+    config.declare_many({key[len('bench_'):]: definition for key, definition in flat.items()})
+    config.freeze()
+    assert benchmark(config.get, 'key_200') == 42
+
+
+@pytest.mark.benchmark(group='get')
+def test_values_attribute(benchmark, nested):
+    config = Config.from_schema(nested)
+    values = config.values
+    assert benchmark(getattr, values.bench_key_10, 'value0') == 42
+
+
+@pytest.mark.benchmark(group='get')
+def test_get_missing(benchmark, flat):
+    config = Config.from_schema(flat, defer_raise=False)
+    assert benchmark(raises, ConfigMissingError, config.get, 'undeclared')
+
+
+@pytest.mark.benchmark(group='get')
+def test_get_deferred_error(benchmark, flat):
+    config = Config.from_schema(flat)
+    config.declare('bench_missing', parse_str())
+    assert benchmark(raises, AggregateConfigError, config.get, 'bench_key_200')
@@ -0,0 +1,47 @@
+"""
+Benchmarks for expanding ${NAME} references
+"""
+import pytest
+
+from env_config import Config, parse_str
+
+from conftest import environment
+
+COUNT = 2000
+
+
+@pytest.fixture(scope='module')
+def schema():
+    variables = {'BENCH_REF_BASE': 'https://example.com'}
+    for i in range(COUNT):
+        variables['BENCH_REF_{}'.format(i)] = '${{BENCH_REF_BASE}}/{}'.format(i)
+    with environment(variables):
+        yield {'bench_ref_{}'.format(i): parse_str() for i in range(COUNT)}
+
+
+@pytest.mark.benchmark(group='interpolation')
+def test_declare_without_interpolation(benchmark, schema):
+    benchmark(Config.from_schema, schema)
+
+
+@pytest.mark.benchmark(group='interpolation')
+def test_declare_with_interpolation(benchmark, schema):
+    benchmark(Config.from_schema, schema, interpolate=True)
+
+
+@pytest.mark.benchmark(group='interpolation')
+def test_reload_unchanged(benchmark, schema):
+    config = Config.from_schema(schema, interpolate=True)
+    benchmark(config.reload)
+
+
+@pytest.mark.benchmark(group='interpolation')
+def test_reload_one_changed_value(benchmark, schema):
+    config = Config.from_schema(schema, interpolate=True)
+    values = iter(range(10 ** 9))
+
+    def reload():
+        with environment({'BENCH_REF_7': '${{BENCH_REF_BASE}}/{}'.format(next(values))}):
+            config.reload()
+
+    benchmark(reload)
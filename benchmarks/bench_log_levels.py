@@ -0,0 +1,33 @@
+"""
+Benchmarks for Config.apply_log_levels()
+"""
+import logging
+
+import pytest
+
+from env_config import Config
+
+from conftest import environment
+
+
+@pytest.fixture(scope='module', params=[100, 10000])
+def large_environment(request):
+    variables = {'BENCH_UNRELATED_{}'.format(i): 'value' for i in range(request.param)}
+    for i in range(20):
+        logging.getLogger('bench.logger{}'.format(i))
+        variables['LOG_LEVEL_BENCH.LOGGER{}'.format(i)] = 'info'
+    with environment(variables):
+        yield
+
+
+@pytest.mark.benchmark(group='apply_log_levels')
+def test_apply_log_levels(benchmark, large_environment):
+    config = Config(defer_raise=False)
+    benchmark(config.apply_log_levels)
+
+
+@pytest.mark.benchmark(group='apply_log_levels')
+def test_reload_log_levels(benchmark, large_environment):
+    config = Config(defer_raise=False)
+    config.apply_log_levels()
+    benchmark(config.reload)
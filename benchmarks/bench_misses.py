@@ -0,0 +1,53 @@
+"""
+Benchmarks comparing variables that are set with optional and tag-gated variables that are missing
+"""
+from itertools import cycle
+
+import pytest
+
+from env_config import Config, parse_int
+
+from conftest import environment
+
+COUNT = 400
+
+
+@pytest.fixture(scope='module')
+def present():
+    variables = {'BENCH_PRESENT_{}'.format(i): '42' for i in range(COUNT)}
+    with environment(variables):
+        yield {'bench_present_{}'.format(i): parse_int() for i in range(COUNT)}
+
+
+@pytest.mark.benchmark(group='misses')
+def test_declare_present(benchmark, present):
+    benchmark(Config.from_schema, present)
+
+
+@pytest.mark.benchmark(group='misses')
+def test_declare_missing_with_default(benchmark):
+    definitions = {'bench_missing_{}'.format(i): parse_int(default=42) for i in range(COUNT)}
+    benchmark(Config.from_schema, definitions)
+
+
+@pytest.mark.benchmark(group='misses')
+def test_declare_missing_in_other_tag(benchmark):
+    definitions = {'bench_missing_{}'.format(i): parse_int() for i in range(COUNT)}
+    benchmark(Config.from_schema, definitions, ('other',), 'default')
+
+
+@pytest.mark.benchmark(group='misses')
+def test_reload_missing_in_other_tag(benchmark):
+    definitions = {'bench_missing_{}'.format(i): parse_int() for i in range(COUNT)}
+    config = Config.from_schema(definitions, ('other',), 'default')
+    benchmark(config.reload)
+
+
+@pytest.mark.benchmark(group='switch_tag')
+def test_switch_tag(benchmark, present):
+    tags = ('web', 'worker', 'cron', 'test')
+    config = Config()
+    for index, (key, definition) in enumerate(present.items()):
+        config.declare(key, definition, (tags[index % len(tags)],), 'web')
+    current = cycle(tags)
+    benchmark(lambda: config.switch_tag(next(current)))
@@ -0,0 +1,59 @@
+"""
+Benchmarks for the list parsers
+"""
+import pytest
+
+from env_config import Config, ValidatorCache, parse_bool_list, parse_float_array, parse_float_list, parse_int_array, \
+    parse_int_list, parse_str_list
+
+from conftest import environment
+
+ELEMENT_COUNTS = [100, 10000, 100000]
+
+
+def raw_list(count, value):
+    return ','.join([value] * count)
+
+
+@pytest.mark.benchmark(group='parse_list')
+@pytest.mark.parametrize('count', ELEMENT_COUNTS)
+@pytest.mark.parametrize('parser,value', [
+    (parse_str_list, 'value'),
+    (parse_int_list, '123'),
+    (parse_float_list, '1.5'),
+    (parse_bool_list, 'yes'),
+])
+def test_parse_list(benchmark, parser, value, count):
+    file_contents = {'BENCH_LIST': raw_list(count, value)}
+    result = benchmark(parser(), 'BENCH_LIST', file_contents, {})
+    assert len(result) == count
+
+
+@pytest.mark.benchmark(group='parse_array')
+@pytest.mark.parametrize('count', ELEMENT_COUNTS)
+@pytest.mark.parametrize('parser,value', [
+    (parse_int_list, '123'),
+    (parse_int_array, '123'),
+    (lambda: parse_int_array(use_numpy=False), '123'),
+    (parse_float_list, '1.5'),
+    (parse_float_array, '1.5'),
+    (lambda: parse_float_array(use_numpy=False), '1.5'),
+], ids=['int_list', 'int_array', 'int_array_no_numpy', 'float_list', 'float_array', 'float_array_no_numpy'])
+def test_parse_array(benchmark, parser, value, count):
+    file_contents = {'BENCH_LIST': raw_list(count, value)}
+    result = benchmark(parser(), 'BENCH_LIST', file_contents, {})
+    assert len(result) == count
+
+
+def port_validator(value):
+    if not 1024 <= value < 65536 or value in range(49152, 49152 + 100):
+        raise ValueError('invalid port {}'.format(value))
+
+
+@pytest.mark.benchmark(group='validate_list')
+@pytest.mark.parametrize('validator_cache', [None, ValidatorCache()], ids=['plain', 'memoized'])
+def test_validate_list_with_duplicates(benchmark, validator_cache):
+    raw = ','.join(str(8000 + i % 10) for i in range(10000))
+    with environment({'BENCH_PORTS': raw}):
+        config = Config(validator_cache=validator_cache)
+        benchmark(config.declare, 'bench_ports', parse_int_list(validator=port_validator))
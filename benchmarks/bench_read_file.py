@@ -0,0 +1,39 @@
+"""
+Benchmarks for reading config files
+"""
+import pytest
+
+from env_config import FileCache
+from env_config.config import _read_file
+
+
+@pytest.fixture(scope='module', params=[10, 1000, 100000])
+def env_file(request, tmp_path_factory):
+    filename = tmp_path_factory.mktemp('env') / 'env_{}'.format(request.param)
+    with open(str(filename), 'w') as f:
+        f.write('#!/usr/bin/env bash\n\n')
+        for i in range(request.param):
+            if i % 10 == 0:
+                f.write('# comment {}\n'.format(i))
+            f.write('export BENCH_FILE_KEY_{0}="value {0}"\n'.format(i))
+    return str(filename)
+
+
+@pytest.mark.benchmark(group='read_file')
+def test_read_file(benchmark, env_file):
+    benchmark(_read_file, env_file)
+
+
+@pytest.mark.benchmark(group='read_file')
+def test_read_file_cached(benchmark, env_file):
+    file_cache = FileCache()
+    file_cache.read(env_file)
+    benchmark(file_cache.read, env_file)
+
+
+@pytest.mark.benchmark(group='read_file')
+def test_read_file_and_lookup(benchmark, env_file):
+    def read_and_lookup():
+        contents = _read_file(env_file)
+        return [contents.get('BENCH_FILE_KEY_{}'.format(i)) for i in range(10)]
+    benchmark(read_and_lookup)
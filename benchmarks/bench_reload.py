@@ -0,0 +1,49 @@
+"""
+Benchmarks for Config.reload()
+"""
+from os import environ
+
+import pytest
+
+from env_config import Config
+
+
+@pytest.mark.benchmark(group='reload')
+def test_reload_unchanged_flat(benchmark, flat):
+    config = Config.from_schema(flat)
+    assert benchmark(config.reload) == frozenset()
+
+
+@pytest.mark.benchmark(group='reload')
+def test_reload_unchanged_nested(benchmark, nested):
+    config = Config.from_schema(nested)
+    assert benchmark(config.reload) == frozenset()
+
+
+@pytest.mark.benchmark(group='reload')
+def test_reload_one_change_flat(benchmark, flat):
+    config = Config.from_schema(flat)
+    values = ['1', '2']
+
+    def change_and_reload():
+        values.reverse()
+        environ['BENCH_KEY_0'] = values[0]
+        return config.reload()
+
+    assert benchmark(change_and_reload) == frozenset(['BENCH_KEY_0'])
+    environ['BENCH_KEY_0'] = '42'
+
+
+@pytest.mark.benchmark(group='reload')
+def test_reload_frozen_one_change_flat(benchmark, flat):
+    config = Config.from_schema(flat)
+    config.freeze()
+    values = ['1', '2']
+
+    def change_and_reload():
+        values.reverse()
+        environ['BENCH_KEY_0'] = values[0]
+        return config.reload()
+
+    assert benchmark(change_and_reload) == frozenset(['BENCH_KEY_0'])
+    environ['BENCH_KEY_0'] = '42'
@@ -0,0 +1,33 @@
+"""
+Benchmarks for loading variables from a stack of sources
+"""
+import pytest
+
+from env_config import Config, DefaultsSource, EnvironSource
+
+from conftest import flat_schema
+
+
+@pytest.fixture(scope='module', params=[1, 4])
+def layers(request):
+    definitions, variables = flat_schema(400, prefix='bench_sources')
+    # the layers in between each hold a share of the variables, the last layer holds all of them
+    keys = sorted(variables)
+    sources = [EnvironSource()]
+    for i in range(request.param - 1):
+        sources.append(DefaultsSource({key: variables[key] for key in keys[i::request.param]}, name=str(i)))
+    sources.append(DefaultsSource(variables))
+    return definitions, sources
+
+
+@pytest.mark.benchmark(group='sources')
+def test_declare_many_from_sources(benchmark, layers):
+    definitions, sources = layers
+    benchmark(Config.from_schema, definitions, sources=sources)
+
+
+@pytest.mark.benchmark(group='sources')
+def test_reload_from_sources(benchmark, layers):
+    definitions, sources = layers
+    config = Config.from_schema(definitions, sources=sources)
+    benchmark(config.reload)
@@ -0,0 +1,44 @@
+"""
+Benchmarks comparing one Config per library with namespaced views of one shared Config
+"""
+import pytest
+
+from env_config import Config, parse_int
+
+from conftest import environment
+
+LIBRARIES = 24
+VARIABLES = 10
+
+
+@pytest.fixture(scope='module')
+def libraries():
+    variables = {}
+    for library in range(LIBRARIES):
+        for index in range(VARIABLES):
+            variables['APP_LIB{}_VALUE_{}'.format(library, index)] = str(index)
+    with environment(variables):
+        yield {
+            'lib{}'.format(library): {'value_{}'.format(index): parse_int() for index in range(VARIABLES)}
+            for library in range(LIBRARIES)
+        }
+
+
+@pytest.mark.benchmark(group='views')
+def test_config_per_library(benchmark, libraries):
+    def load():
+        for library, definitions in libraries.items():
+            Config(namespace='app_' + library).declare_many(definitions)
+
+    benchmark(load)
+
+
+@pytest.mark.benchmark(group='views')
+def test_views_of_one_config(benchmark, libraries):
+    def load():
+        config = Config(namespace='app', lazy=True)
+        for library, definitions in libraries.items():
+            config.view(library).declare_many(definitions)
+        config.validate_all()
+
+    benchmark(load)
@@ -0,0 +1,97 @@
+"""
+Synthetic schemas and environments for the benchmarks.
+
+run all benchmarks:          python -m pytest benchmarks/bench_*.py
+save results of a release:   python -m pytest benchmarks/bench_*.py --benchmark-autosave
+compare with saved results:  python -m pytest benchmarks/bench_*.py --benchmark-compare
+"""
+from contextlib import contextmanager
+from os import environ
+
+import pytest
+
+from env_config import parse_bool, parse_float, parse_int, parse_int_list, parse_str
+
+
+@contextmanager
+def environment(variables):
+    """
+    set environment variables and restore the previous environment afterwards
+    :param variables: dict(str, str)
+    """
+    previous = {key: environ.get(key) for key in variables}
+    environ.update(variables)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                del environ[key]
+            else:
+                environ[key] = value
+
+
+_SCALARS = (
+    (parse_int, '42'),
+    (parse_float, '4.2'),
+    (parse_str, 'value'),
+    (parse_bool, 'yes'),
+    (parse_int_list, '1,2,3,4'),
+)
+
+
+def flat_schema(count, prefix='bench'):
+    """
+    :param count: int number of variables
+    :param prefix: str
+    :return: tuple(dict, dict) the definitions and the environment they need
+    """
+    definitions = {}
+    variables = {}
+    for i in range(count):
+        parser, raw = _SCALARS[i % len(_SCALARS)]
+        key = '{}_key_{}'.format(prefix, i)
+        definitions[key] = parser()
+        variables[key.upper()] = raw
+    return definitions, variables
+
+
+def nested_schema(count, depth, width, prefix='bench'):
+    """
+    :param count: int number of top level keys
+    :param depth: int nesting depth of each key
+    :param width: int number of variables on each level
+    :param prefix: str
+    :return: tuple(dict, dict) the definitions and the environment they need
+    """
+    variables = {}
+
+    def build(variable_name, level):
+        definition = {}
+        for i in range(width):
+            parser, raw = _SCALARS[i % len(_SCALARS)]
+            definition['value{}'.format(i)] = parser()
+            variables['{}_VALUE{}'.format(variable_name, i).upper()] = raw
+        if level < depth:
+            definition['nested'] = build('{}_nested'.format(variable_name), level + 1)
+        return definition
+
+    definitions = {}
+    for i in range(count):
+        key = '{}_key_{}'.format(prefix, i)
+        definitions[key] = build(key, 1)
+    return definitions, variables
+
+
+@pytest.fixture(scope='module')
+def flat():
+    definitions, variables = flat_schema(400)
+    with environment(variables):
+        yield definitions
+
+
+@pytest.fixture(scope='module')
+def nested():
+    definitions, variables = nested_schema(20, depth=4, width=5)
+    with environment(variables):
+        yield definitions
@@ -1,10 +1,19 @@
 from .config import AggregateConfigError, boolean, Config, ConfigError, ConfigMissingError, ConfigNotInCurrentTagError,\
-                    ConfigParseError, ConfigValueError, parse_bool, parse_bool_list, parse_float, parse_float_list, \
-                    parse_int, parse_int_list, parse_str, parse_str_list, ConfigFileEmptyError
+                    ConfigParseError, ConfigValueError, parse_bool, parse_bool_list, parse_float, parse_float_array, \
+                    parse_float_list, parse_int, parse_int_array, parse_int_list, parse_str, parse_str_list, \
+                    ConfigFileEmptyError, ConfigValues, ConfigView, ErrorRegistry, FileCache, ValidatorCache
+from .aio import ChangeStream
+from .envfile import EnvFile
+from .interpolation import Interpolator
+from .sources import DefaultsSource, EnvironSource, FileSource, SecretsDirSource, Source
+from .stats import ConfigStats
+from .warm_cache import WarmCache
+from .watcher import FileWatcher
 
 __all__ = [
     'AggregateConfigError',
     'boolean',
+    'ChangeStream',
     'Config',
     'ConfigError',
     'ConfigFileEmptyError',
@@ -12,13 +21,30 @@ __all__ = [
     'ConfigMissingError',
     'ConfigNotInCurrentTagError',
     'ConfigParseError',
+    'ConfigStats',
     'ConfigValueError',
+    'ConfigValues',
+    'ConfigView',
+    'DefaultsSource',
+    'EnvFile',
+    'EnvironSource',
+    'ErrorRegistry',
+    'FileCache',
+    'FileSource',
+    'FileWatcher',
+    'Interpolator',
     'parse_bool',
     'parse_bool_list',
     'parse_float',
+    'parse_float_array',
     'parse_float_list',
     'parse_int',
+    'parse_int_array',
     'parse_int_list',
     'parse_str',
     'parse_str_list',
+    'SecretsDirSource',
+    'Source',
+    'ValidatorCache',
+    'WarmCache',
 ]
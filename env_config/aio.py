@@ -0,0 +1,78 @@
+from threading import Lock
+
+# asyncio is slow to import, it is imported when a stream is iterated so importing env_config stays cheap
+
+
+class ChangeStream(object):
+
+    def __init__(self, config, interval=None, executor=None):
+        """
+        Asynchronous iterator over the changes of a Config.
+
+        Yields the changes of every reload() that changed something, no matter which thread called it.
+
+        :param config: Config
+        :param interval: float if set, reload every interval seconds while waiting for changes
+        :param executor: concurrent.futures.Executor executor for the periodic reloads, defaults to the loop's
+        """
+        super().__init__()
+        self.__config = config
+        self.__interval = interval
+        self.__executor = executor
+        # the stream is bound to the loop that iterates it first, changes until then are kept in the backlog.
+        # The queue is created then as well, before Python 3.10 it is bound to the current loop on creation.
+        self.__loop = None
+        self.__lock = Lock()
+        self.__backlog = []
+        self.__queue = None
+        self.__closed = False
+        config.add_listener(self.__on_change)
+
+    def close(self):
+        """
+        stop receiving changes
+        :return: None
+        """
+        if not self.__closed:
+            self.__closed = True
+            self.__config.remove_listener(self.__on_change)
+
+    def __on_change(self, changes):
+        with self.__lock:
+            loop = self.__loop
+            if loop is None:
+                self.__backlog.append(changes)
+                return
+        loop.call_soon_threadsafe(self.__queue.put_nowait, changes)
+
+    def __bind(self):
+        import asyncio
+        with self.__lock:
+            if self.__loop is None:
+                self.__loop = asyncio.get_running_loop()
+                self.__queue = asyncio.Queue()
+                for changes in self.__backlog:
+                    self.__queue.put_nowait(changes)
+                self.__backlog = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__closed:
+            raise StopAsyncIteration
+        self.__bind()
+        if self.__interval is None:
+            return await self.__queue.get()
+        import asyncio
+        while True:
+            try:
+                return await asyncio.wait_for(self.__queue.get(), self.__interval)
+            except asyncio.TimeoutError:
+                await self.__config.areload(self.__executor)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
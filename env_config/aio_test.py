@@ -0,0 +1,94 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from os import environ, path
+from unittest import TestCase
+
+from env_config import Config, parse_str
+
+
+class ImportTest(TestCase):
+    def test_asyncio_is_imported_lazily(self):
+        code = 'import sys, env_config; print("asyncio" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=path.dirname(path.dirname(__file__)))
+        self.assertEqual(b'False', output.strip())
+
+
+class AsyncTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        environ['ASYNC_KEY'] = 'original value'
+        self.config = Config(defer_raise=False)
+
+    def tearDown(self):
+        super().tearDown()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        del environ['ASYNC_KEY']
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(asyncio.wait_for(coroutine, 5))
+
+
+class AreloadTest(AsyncTestCase):
+    def test_areload(self):
+        validated_in = []
+        self.config.declare('async_key', parse_str(validator=lambda x: validated_in.append(threading.get_ident())))
+        environ['ASYNC_KEY'] = 'new value'
+
+        changes = self.run_async(self.config.areload())
+
+        self.assertEqual(frozenset(['ASYNC_KEY']), changes)
+        self.assertEqual('new value', self.config.get('async_key'))
+        self.assertNotEqual(threading.get_ident(), validated_in[-1])
+
+
+class WatchTest(AsyncTestCase):
+    def test_yield_changes_of_reloads_in_other_threads(self):
+        self.config.declare('async_key', parse_str())
+
+        async def watch():
+            async with self.config.watch() as changes:
+                environ['ASYNC_KEY'] = 'new value'
+                threading.Thread(target=self.config.reload).start()
+                async for change in changes:
+                    return change
+
+        self.assertEqual(frozenset(['ASYNC_KEY']), self.run_async(watch()))
+
+    def test_reload_periodically(self):
+        self.config.declare('async_key', parse_str())
+
+        async def watch():
+            async with self.config.watch(interval=0.01) as changes:
+                environ['ASYNC_KEY'] = 'new value'
+                async for change in changes:
+                    return change
+
+        self.assertEqual(frozenset(['ASYNC_KEY']), self.run_async(watch()))
+        self.assertEqual('new value', self.config.get('async_key'))
+
+    def test_bind_to_the_loop_that_iterates(self):
+        self.config.declare('async_key', parse_str())
+        asyncio.set_event_loop(None)
+        changes = self.config.watch()
+        environ['ASYNC_KEY'] = 'new value'
+        self.config.reload()
+
+        async def watch():
+            async for change in changes:
+                return change
+
+        self.assertEqual(frozenset(['ASYNC_KEY']), self.run_async(watch()))
+        changes.close()
+
+    def test_stop_iteration_after_close(self):
+        async def watch():
+            changes = self.config.watch()
+            changes.close()
+            return [change async for change in changes]
+
+        self.assertEqual([], self.run_async(watch()))
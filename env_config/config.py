@@ -1,7 +1,21 @@
 import logging
+from array import array
+from collections import namedtuple, OrderedDict
 from functools import partial
-from os import environ, path, getcwd
+from keyword import iskeyword
+from os import environ, path, getcwd, stat
+from threading import Lock, RLock
+from time import perf_counter
 
+from .envfile import EnvFile
+from .interpolation import Interpolator
+from .stats import ConfigStats
+from .warm_cache import fingerprint
+from .watcher import FileWatcher
+
+# numpy is optional and slow to import, it is imported the first time an array is parsed with it
+_numpy = None
+_numpy_imported = False
 
 MODULE_NAME='env_config'
 
@@ -14,50 +28,73 @@ LOG_LEVEL_DEFINITIONS = {
 }
 
 
-def _load_scalar(parser, default, validator, key, file_contents):
+def _lookup(key, file_contents, environment):
+    value = environment.get(key)
+    if value is None:
+        value = file_contents.get(key)
+    return value
+
+
+def _default_value(default, key):
+    if default is None:
+        raise ConfigValueError(key)
+    return default
+
+
+def _convert_scalar(parser, key, raw):
     try:
-        values = parser(environ[key])
-    except KeyError:
-        try:
-            values = parser(file_contents[key])
-        except KeyError:
-            if default is None:
-                raise ConfigValueError(key)
-            return default
-        except BaseException as e:
-            raise ConfigParseError(key, e)
+        return parser(raw)
     except BaseException as e:
         raise ConfigParseError(key, e)
 
+
+def _convert_list(parser, separator, key, raw):
     try:
-        validator(values)
-        return values
+        return [parser(value.strip()) for value in raw.split(separator)]
     except BaseException as e:
         raise ConfigParseError(key, e)
 
 
-def _load_list(parser, default, validator, separator, key, file_contents):
+def _validate_scalar(validator, key, value):
     try:
-        values = [parser(value.strip()) for value in environ[key].split(separator)]
-    except KeyError:
-        try:
-            values = [parser(value.strip()) for value in file_contents[key].split(separator)]
-        except KeyError:
-            if default is None:
-                raise ConfigValueError(key)
-            return default
-        except BaseException as e:
-            raise ConfigParseError(key, e)
+        validator(value)
+        return value
     except BaseException as e:
         raise ConfigParseError(key, e)
 
+
+def _validate_list(validator, key, values):
     try:
-        [validator(value) for value in values]
+        if isinstance(validator, _MemoizedValidator):
+            validator.validate_list(values)
+        else:
+            [validator(value) for value in values]
         return values
     except BaseException as e:
         raise ConfigParseError(key, e)
 
 
+def _parse_scalar(parser, default, validator, key, raw):
+    if raw is None:
+        return _default_value(default, key)
+    return _validate_scalar(validator, key, _convert_scalar(parser, key, raw))
+
+
+def _parse_list(parser, default, validator, separator, key, raw):
+    if raw is None:
+        return _default_value(default, key)
+    return _validate_list(validator, key, _convert_list(parser, separator, key, raw))
+
+
+def _load_scalar(parser, default, validator, key, file_contents, environment=environ, memoize=True):
+    # memoize is only read by Config, when it compiles the definition with a ValidatorCache
+    return _parse_scalar(parser, default, validator, key, _lookup(key, file_contents, environment))
+
+
+def _load_list(parser, default, validator, separator, key, file_contents, environment=environ, memoize=True):
+    return _parse_list(parser, default, validator, separator, key, _lookup(key, file_contents, environment))
+
+
 def boolean(value):
     truthy = ['yes', 'true', '1']
     falsy = ['no', 'false', '0']
@@ -94,10 +131,11 @@ class ConfigValueError(ConfigError):
 
 
 class ConfigParseError(ConfigError):
-    def __init__(self, key, previous_error):
+    def __init__(self, key, previous_error, source=None):
         super().__init__()
         self.__key = key
         self.__previous_error = previous_error
+        self.__source = source
 
     @property
     def key(self):
@@ -107,12 +145,25 @@ class ConfigParseError(ConfigError):
     def previous_error(self):
         return self.__previous_error
 
+    @property
+    def source(self):
+        """
+        :return: str the name of the source the value was read from, if Config has explicit sources
+        """
+        return self.__source
+
     @property
     def message(self):
+        if self.source is not None:
+            return "Error while parsing value for {} from {}: {}".format(
+                self.key, self.source, str(self.__previous_error)
+            )
         return "Error while parsing value for {}: {}".format(self.key, str(self.__previous_error))
 
     @property
     def instruction(self):
+        if self.source is not None:
+            return "{} (from {}): {}".format(self.key, self.source, str(self.previous_error))
         return "{}: {}".format(self.key, str(self.previous_error))
 
     def __str__(self):
@@ -161,7 +212,7 @@ class ConfigNotInCurrentTagError(ConfigError):
 class AggregateConfigError(ConfigError):
     def __init__(self, exceptions, filename):
         super().__init__()
-        self.__exceptions = exceptions
+        self.__exceptions = list(exceptions)
         self.__filename = filename
 
     @property
@@ -219,111 +270,863 @@ class ConfigFileEmptyError(ConfigError):
             .format(self.__file_name)
 
 
-def parse_int(default=None, validator=lambda x: x):
-    return partial(_load_scalar, int, default, validator)
+def _error_identity(ex):
+    if isinstance(ex, ConfigValueError):
+        return type(ex), ex.variable_name
+    if isinstance(ex, (ConfigParseError, ConfigMissingError, ConfigNotInCurrentTagError)):
+        return type(ex), ex.key
+    return type(ex), str(ex)
 
 
-def parse_float(default=None, validator=lambda x: x):
-    return partial(_load_scalar, float, default, validator)
+class ErrorRegistry(object):
 
+    def __init__(self):
+        """
+        Collects config errors.
 
-def parse_str(default=None, validator=lambda x: x):
-    return partial(_load_scalar, lambda x: x, default, validator)
+        Errors are grouped by the key they were found for and de-duplicated by error kind and variable name.
+        """
+        super().__init__()
+        self.__errors = {}
+        self.__groups = {}
+        self.__lock = Lock()
 
+    def add(self, group, ex):
+        """
+        record an error
+        :param group: str the key the error was found for
+        :param ex: BaseException
+        :return: None
+        """
+        with self.__lock:
+            self.__add(group, ex)
 
-def parse_bool(default=None, validator=lambda x: x):
-    return partial(_load_scalar, boolean, default, validator)
+    def replace(self, group, exceptions):
+        """
+        replace all errors recorded for a group
+        :param group: str the key the errors were found for
+        :param exceptions: list(BaseException)
+        :return: None
+        """
+        with self.__lock:
+            self.__discard(group)
+            for ex in exceptions:
+                self.__add(group, ex)
 
+    def discard(self, group):
+        with self.__lock:
+            self.__discard(group)
+
+    def scoped(self, prefix):
+        """
+        :param prefix: str
+        :return: ErrorRegistry a copy with the errors of the groups that start with prefix
+        """
+        registry = ErrorRegistry()
+        with self.__lock:
+            for group, identities in self.__groups.items():
+                if group.startswith(prefix):
+                    for identity in identities:
+                        registry.__add(group, self.__errors[identity])
+        return registry
+
+    def copy(self):
+        registry = ErrorRegistry()
+        with self.__lock:
+            for identity, ex in self.__errors.items():
+                registry.__add(identity[0], ex)
+        return registry
+
+    def __add(self, group, ex):
+        identity = (group,) + _error_identity(ex)
+        if identity not in self.__errors:
+            self.__groups.setdefault(group, []).append(identity)
+        self.__errors[identity] = ex
+
+    def __discard(self, group):
+        for identity in self.__groups.pop(group, ()):
+            del self.__errors[identity]
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(list(self.__errors.values()))
+
+    def __len__(self):
+        return len(self.__errors)
+
+
+class ValidatorCache(object):
+
+    def __init__(self, maxsize=4096):
+        """
+        Bounded LRU of values that passed validation, shared by all validators of a Config.
+
+        A validator is called once per distinct value, across declarations, reloads and the elements of lists.
+        Only successful validations are remembered, invalid values are validated again.
+
+        :param maxsize: int the number of (validator, value) pairs to remember
+        """
+        super().__init__()
+        self.__maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def validate(self, validator, value):
+        """
+        call validator(value) unless it already accepted an equal value of the same type
+        :param validator: callable
+        :param value: Any
+        :return: None
+        """
+        key = (validator, type(value), value)
+        try:
+            with self.__lock:
+                if key in self.__entries:
+                    self.__entries.move_to_end(key)
+                    self.__hits += 1
+                    return
+                self.__misses += 1
+        except (TypeError, ValueError):
+            # unhashable values can not be remembered, memoryviews raise ValueError for most formats
+            validator(value)
+            return
+        validator(value)
+        with self.__lock:
+            self.__entries[key] = True
+            if len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class _MemoizedValidator(object):
+    __slots__ = ('__wrapped__', 'cache')
+
+    def __init__(self, validator, cache):
+        self.__wrapped__ = validator
+        self.cache = cache
+
+    def __call__(self, value):
+        self.cache.validate(self.__wrapped__, value)
+
+    def validate_list(self, values):
+        seen = set()
+        for value in values:
+            try:
+                if value in seen:
+                    continue
+                seen.add(value)
+            except TypeError:
+                pass
+            self.cache.validate(self.__wrapped__, value)
+
+
+def parse_int(default=None, validator=lambda x: x, memoize=True):
+    return partial(_load_scalar, int, default, validator, memoize=memoize)
+
+
+def parse_float(default=None, validator=lambda x: x, memoize=True):
+    return partial(_load_scalar, float, default, validator, memoize=memoize)
+
+
+def parse_str(default=None, validator=lambda x: x, memoize=True):
+    return partial(_load_scalar, lambda x: x, default, validator, memoize=memoize)
+
+
+def parse_bool(default=None, validator=lambda x: x, memoize=True):
+    return partial(_load_scalar, boolean, default, validator, memoize=memoize)
+
+
+def parse_str_list(default=None, validator=lambda x: x, separator=',', memoize=True):
+    return partial(_load_list, lambda x: x, default, validator, separator, memoize=memoize)
+
+
+def parse_int_list(default=None, validator=lambda x: x, separator=',', memoize=True):
+    return partial(_load_list, int, default, validator, separator, memoize=memoize)
+
+
+def parse_float_list(default=None, validator=lambda x: x, separator=',', memoize=True):
+    return partial(_load_list, float, default, validator, separator, memoize=memoize)
+
+
+def parse_bool_list(default=None, validator=lambda x: x, separator=',', memoize=True):
+    return partial(_load_list, boolean, default, validator, separator, memoize=memoize)
+
+
+def _import_numpy():
+    """
+    :return: module numpy or None if it is not installed
+    """
+    global _numpy, _numpy_imported
+    if not _numpy_imported:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+        _numpy_imported = True
+    return _numpy
+
+
+def _parse_array(typecode, separator, use_numpy, raw):
+    numpy = _import_numpy() if use_numpy else None
+    # negative values never fit into unsigned types, array() reports them as OverflowError
+    if numpy is not None and not (typecode in 'BHILQ' and '-' in raw):
+        dtype = numpy.dtype(typecode)
+        # numpy wraps integers that do not fit into narrow types, so they are parsed with 64 bits and checked
+        parse_dtype = dtype
+        if dtype.kind in 'iu':
+            parse_dtype = numpy.dtype(numpy.int64 if dtype.kind == 'i' else numpy.uint64)
+        values = numpy.fromstring(raw, dtype=parse_dtype, sep=separator)
+        if len(values) != raw.count(separator) + 1:
+            raise ValueError('"{}" is not a list of numbers separated by "{}"'.format(raw, separator))
+        if dtype.kind in 'iu':
+            limits = numpy.iinfo(parse_dtype)
+            if values.max() == limits.max or (dtype.kind == 'i' and values.min() == limits.min):
+                # numpy clips values that do not fit into 64 bits, parse exactly to detect an overflow
+                values = numpy.array(array(typecode, [int(value) for value in raw.split(separator)]), dtype=dtype)
+            elif parse_dtype != dtype:
+                limits = numpy.iinfo(dtype)
+                if values.max() > limits.max or values.min() < limits.min:
+                    raise OverflowError('"{}" does not fit into type code "{}"'.format(raw, typecode))
+                values = values.astype(dtype)
+        values.setflags(write=False)
+        return values
+    parser = float if typecode in 'fd' else int
+    values = array(typecode, map(parser, raw.split(separator)))
+    # a read-only view, values shared by all readers of a config can't be changed
+    return memoryview(values).toreadonly()
+
+
+def parse_int_array(default=None, validator=lambda x: x, separator=',', typecode='q', use_numpy=True, memoize=True):
+    """
+    parse a list of integers into a compact read-only array.
+    The validator is called once with the whole array.
+
+    :param typecode: str the array module type code of the elements
+    :param use_numpy: bool return a read-only numpy array if numpy is installed, a read-only memoryview otherwise
+    """
+    return partial(_load_scalar, partial(_parse_array, typecode, separator, use_numpy), default, validator,
+                   memoize=memoize)
+
+
+def parse_float_array(default=None, validator=lambda x: x, separator=',', typecode='d', use_numpy=True,
+                      memoize=True):
+    """
+    parse a list of floats into a compact read-only array.
+    The validator is called once with the whole array.
+
+    :param typecode: str the array module type code of the elements
+    :param use_numpy: bool return a read-only numpy array if numpy is installed, a read-only memoryview otherwise
+    """
+    return partial(_load_scalar, partial(_parse_array, typecode, separator, use_numpy), default, validator,
+                   memoize=memoize)
+
+
+# the validators parse_*() use if none is passed, validating with them does nothing
+_NO_VALIDATORS = frozenset(parse.__defaults__[1] for parse in (
+    parse_int, parse_float, parse_str, parse_bool, parse_str_list, parse_int_list, parse_float_list, parse_bool_list,
+    parse_int_array, parse_float_array
+))
+
+PlanEntry = namedtuple('PlanEntry', ['env_key', 'path', 'definition', 'parser', 'validator', 'default',
+                                     'separator', 'tags'])
+
+Plan = namedtuple('Plan', ['key', 'tags', 'entries', 'layout'])
+
+Outcome = namedtuple('Outcome', ['raw', 'value', 'error'])
+
+PlanResult = namedtuple('PlanResult', ['value', 'exceptions', 'outcomes', 'changes'])
+
+Snapshot = namedtuple('Snapshot', ['values', 'errors', 'frozen', 'filename', 'value_objects', 'pending',
+                                   'provenance'])
+
+_FAILED = object()
+_UNCHANGED = object()
+_UNKNOWN = object()
+# the value of every variable that is not declared for its current tag, get() raises ConfigNotInCurrentTagError for it
+_INACTIVE = object()
+
+
+def _describe_definition(definition):
+    if isinstance(definition, partial):
+        memoize = definition.keywords.get('memoize', True)
+        if definition.func is _load_scalar:
+            parser, default, validator = definition.args
+            return parser, validator, default, None, memoize
+        if definition.func is _load_list:
+            return definition.args[0], definition.args[2], definition.args[1], definition.args[3], memoize
+    return None, None, None, None, False
+
+
+def _compile_entry(env_key, value_path, definition, tags, validator_cache=None):
+    parser, validator, default, separator, memoize = _describe_definition(definition)
+    if validator_cache is not None and memoize and validator not in _NO_VALIDATORS:
+        validator = _MemoizedValidator(validator, validator_cache)
+    return PlanEntry(env_key, value_path, definition, parser, validator, default, separator, tags)
+
+
+def _compile(key, definition, tags, validator_cache=None):
+    """
+    flatten a (possibly nested) definition into a load plan
+    :param key: str the namespaced key the definition is declared for
+    :param definition: Any
+    :param tags: set(str)
+    :param validator_cache: ValidatorCache memoize the validators of the definition if set
+    :return: Plan
+    """
+    tags = frozenset(tags)
+    if not isinstance(definition, dict):
+        return Plan(key, tags, (_compile_entry(key.upper(), (), definition, tags, validator_cache),), None)
+
+    entries = []
+    layout = []
+    container_count = 1
+
+    def flatten(prefix, value_path, parent, nested_definition):
+        nonlocal container_count
+        for k, v in nested_definition.items():
+            variable_name = '{}_{}'.format(prefix, k)
+            if isinstance(v, dict):
+                layout.append((parent, k, None))
+                container_count += 1
+                flatten(variable_name, value_path + (k,), container_count - 1, v)
+            else:
+                layout.append((parent, k, len(entries)))
+                entries.append(_compile_entry(variable_name.upper(), value_path + (k,), v, tags, validator_cache))
 
-def parse_str_list(default=None, validator=lambda x: x, separator=','):
-    return partial(_load_list, lambda x: x, default, validator, separator)
+    flatten(key, (), 0, definition)
+    return Plan(key, tags, tuple(entries), tuple(layout))
 
 
-def parse_int_list(default=None, validator=lambda x: x, separator=','):
-    return partial(_load_list, int, default, validator, separator)
+def _convert_entry(entry, raw):
+    if entry.separator is None:
+        return _convert_scalar(entry.parser, entry.env_key, raw)
+    return _convert_list(entry.parser, entry.separator, entry.env_key, raw)
 
 
-def parse_float_list(default=None, validator=lambda x: x, separator=','):
-    return partial(_load_list, float, default, validator, separator)
+def _validate_entry(entry, value):
+    if entry.separator is None:
+        return _validate_scalar(entry.validator, entry.env_key, value)
+    return _validate_list(entry.validator, entry.env_key, value)
 
 
-def parse_bool_list(default=None, validator=lambda x: x, separator=','):
-    return partial(_load_list, boolean, default, validator, separator)
+def _parse_entry(entry, raw):
+    return _validate_entry(entry, _convert_entry(entry, raw))
 
 
-def __parse_definition_result(result):
-    if isinstance(result, tuple):
-        return result[0], result[1]
-    else:
-        return result, []
+def _missing_value(entry):
+    """
+    resolve an entry without raw value. Optional keys miss often, so misses are returned, not raised.
+    :return: tuple(Any, ConfigError) the value and the error to report, if any
+    """
+    if entry.default is not None:
+        return entry.default, None
+    return _FAILED, ConfigValueError(entry.env_key)
 
 
-def _parse_dict(prefix, definition, defer_raise, tags, current_tag, file_contents):
-    result = {}
+def _same_value(a, b):
+    if isinstance(a, BaseException) and isinstance(b, BaseException):
+        return type(a) is type(b) and str(a) == str(b)
+    try:
+        return bool(a == b)
+    except BaseException:
+        return False
+
+
+def _lookup_counted(key, file_contents, environment, stats):
+    raw = _lookup(key, file_contents, environment)
+    stats.record_lookup(key in environment, len(file_contents) > 0)
+    return raw
+
+
+def _parse_entry_timed(entry, raw, file_contents, stats):
+    start = perf_counter()
+    converted = None
+    try:
+        if entry.parser is None:
+            return entry.definition(entry.env_key, file_contents)
+        value = _convert_entry(entry, raw)
+        converted = perf_counter()
+        return _validate_entry(entry, value)
+    finally:
+        end = perf_counter()
+        if converted is None:
+            stats.record_parse(entry.env_key, end - start, 0.0)
+        else:
+            stats.record_parse(entry.env_key, converted - start, end - converted)
+
+
+def _plan_raws(plan, file_contents, environment):
+    """
+    :return: list(str) the raw value of each entry or None if the plan has custom definitions
+    """
+    raws = []
+    for entry in plan.entries:
+        if entry.parser is None:
+            return None
+        raws.append(_lookup(entry.env_key, file_contents, environment))
+    return raws
+
+
+def _merge_sources(sources, keys):
+    """
+    merge the raw values of a stack of sources into one index
+    :param sources: tuple(Source) in order of precedence, the first source that has a key supplies its value
+    :param keys: set(str) environment variables of plans that are active in the current tag
+    :return: tuple(dict, dict) the raw values and the name of the source of each value
+    """
+    index = {}
+    provenance = {}
+    for source in sources:
+        missing = keys.difference(index)
+        if len(missing) == 0:
+            break
+        for key, raw in source.load(missing).items():
+            if key in missing:
+                index[key] = raw
+                provenance[key] = source.name
+    return index, provenance
+
+
+def _load_plan(plan, current_tag, defer_raise, file_contents, environment=environ, previous=None, stats=None,
+               provenance=None, cached=None, unresolved=None):
+    """
+    evaluate a load plan
+    :param plan: Plan
+    :param current_tag: str
+    :param defer_raise: bool
+    :param file_contents: dict
+    :param environment: dict the environment to read variables from
+    :param previous: tuple(Outcome) outcomes of the last load of this plan.
+                     Entries whose raw value did not change are not parsed again.
+    :param stats: ConfigStats records lookups and parse times if set
+    :param provenance: dict source names by environment variable, added to parse errors if set
+    :param cached: tuple(Outcome) outcomes restored from a WarmCache, reused like previous outcomes
+                   but reported as changes
+    :param unresolved: dict errors of environment variables whose references could not be expanded
+    :return: PlanResult the value is _FAILED if the plan could not be loaded, _INACTIVE if it is not declared for
+             current_tag and _UNCHANGED if no raw value changed since the previous load
+    """
+    if current_tag not in plan.tags:
+        return PlanResult(_INACTIVE, [], (), [])
+    outcomes = []
     exceptions = []
-    for k, v in definition.items():
-        variable_name = "{}_{}".format(prefix, k)
-        if isinstance(definition[k], dict):
-            result[k], ex = __parse_definition_result(
-                _parse_dict(variable_name, definition[k], defer_raise, tags, current_tag, file_contents))
-            exceptions = exceptions + ex
+    changes = []
+    for index, entry in enumerate(plan.entries):
+        failure = unresolved.get(entry.env_key) if unresolved is not None else None
+        if entry.parser is not None:
+            if stats is None:
+                raw = _lookup(entry.env_key, file_contents, environment)
+            else:
+                raw = _lookup_counted(entry.env_key, file_contents, environment, stats)
+            reusable = previous if previous is not None else cached
+            if reusable is not None and reusable[index].raw == raw and failure is None:
+                outcome = reusable[index]
+                outcomes.append(outcome)
+                if outcome.error is not None:
+                    exceptions.append(outcome.error)
+                if previous is None:
+                    changes.append(entry.env_key)
+                continue
+        else:
+            raw = _UNKNOWN
+
+        error = None
+        if raw is None:
+            value, error = _missing_value(entry)
+            if error is not None:
+                if not defer_raise:
+                    raise error
+                exceptions.append(error)
         else:
             try:
-                result[k], ex = __parse_definition_result(definition[k](variable_name.upper(), file_contents))
-                exceptions = exceptions + ex
+                if failure is not None:
+                    raise ConfigParseError(entry.env_key, failure)
+                if stats is not None:
+                    value = _parse_entry_timed(entry, raw, file_contents, stats)
+                elif entry.parser is None:
+                    value = entry.definition(entry.env_key, file_contents)
+                else:
+                    value = _parse_entry(entry, raw)
             except BaseException as e:
-                if current_tag not in tags:
-                    result[k] = ConfigNotInCurrentTagError(k, current_tag)
-                elif defer_raise:
+                if provenance is not None and isinstance(e, ConfigParseError) and e.source is None:
+                    e = ConfigParseError(e.key, e.previous_error, provenance.get(e.key))
+                if defer_raise:
+                    value = _FAILED
+                    error = e
                     exceptions.append(e)
                 else:
                     raise e
-    return result, exceptions
+
+        if previous is None or entry.parser is not None or not _same_value(previous[index].value, value):
+            changes.append(entry.env_key)
+        outcomes.append(Outcome(raw, value, error))
+
+    outcomes = tuple(outcomes)
+    if previous is not None and len(changes) == 0:
+        return PlanResult(_UNCHANGED, exceptions, outcomes, changes)
+
+    if plan.layout is None:
+        return PlanResult(outcomes[0].value, exceptions, outcomes, changes)
+
+    nodes = [{}]
+    for parent, name, index in plan.layout:
+        if index is None:
+            node = {}
+            nodes[parent][name] = node
+            nodes.append(node)
+        elif outcomes[index].value is not _FAILED:
+            nodes[parent][name] = outcomes[index].value
+    return PlanResult(nodes[0], exceptions, outcomes, changes)
+
+
+class ConfigValues(object):
+    """
+    Read-only attribute access to loaded config values. Nested dicts are ConfigValues as well.
+    """
+    __slots__ = ('_errors',)
+
+    def __getattr__(self, name):
+        errors = object.__getattribute__(self, '_errors')
+        if name in errors:
+            raise errors[name]
+        raise AttributeError("'{}' has no config value '{}'".format(type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('config values are read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError('config values are read-only')
+
+    def __repr__(self):
+        values = []
+        for name in type(self).__slots__:
+            try:
+                values.append('{}={!r}'.format(name, object.__getattribute__(self, name)))
+            except AttributeError:
+                pass
+        return '{}({})'.format(type(self).__name__, ', '.join(values))
+
+
+_value_classes = {}
+
+
+def _value_class(names):
+    try:
+        return _value_classes[names]
+    except KeyError:
+        return _value_classes.setdefault(names, type('ConfigValues', (ConfigValues,), {'__slots__': names}))
+
+
+def _build_value_object(values):
+    """
+    convert (nested) dicts of loaded values into ConfigValues objects
+    :param values: dict
+    :return: ConfigValues
+    """
+    names = tuple(name for name in values
+                  if isinstance(name, str) and name.isidentifier() and not iskeyword(name) and name != '_errors')
+    value_object = object.__new__(_value_class(names))
+    errors = {}
+    for name in names:
+        value = values[name]
+        if isinstance(value, BaseException):
+            errors[name] = value
+            continue
+        if isinstance(value, dict):
+            value = _build_value_object(value)
+        object.__setattr__(value_object, name, value)
+    object.__setattr__(value_object, '_errors', errors)
+    return value_object
 
 
 def _read_file(filename):
-    variable_marker = 'export ' # which variables to load
-    key_value_divider = '='
-    result = {}
-    with open(filename, 'r') as f:
-        for line in f.readlines():
-            if len(line) == 0 or line[0] == '#' or len(line) < len(variable_marker):
-                continue
-            if line[:len(variable_marker)] == variable_marker:
-                parts = line.replace(variable_marker, '').split(key_value_divider)
-                result[parts[0]] = parts[1].strip('"\'\n')
-    if len(result.keys()) == 0:
+    result = EnvFile.read(filename)
+    if len(result) == 0:
         raise ConfigFileEmptyError(filename)
     return result
 
 
+class FileCache(object):
+
+    def __init__(self):
+        """
+        Cache for parsed config files.
+
+        Files are parsed once and only read again when their inode, mtime or size change.
+        """
+        super().__init__()
+        self.__entries = {}
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def read(self, filename):
+        """
+        return the parsed contents of a config file
+        :param filename: str
+        :return: EnvFile
+        """
+        return self.read_cached(filename)[0]
+
+    def read_cached(self, filename):
+        """
+        :param filename: str
+        :return: tuple(EnvFile, bool) the parsed contents of a config file and whether they came from the cache
+        """
+        resolved = path.realpath(filename)
+        file_stat = stat(resolved)
+        signature = (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+        with self.__lock:
+            entry = self.__entries.get(resolved)
+            if entry is not None and entry[0] == signature:
+                self.__hits += 1
+                return entry[1], True
+            self.__misses += 1
+        contents = _read_file(filename)
+        with self.__lock:
+            self.__entries[resolved] = (signature, contents)
+        return contents, False
+
+    def clear(self):
+        with self.__lock:
+            self.__entries = {}
+            self.__hits = 0
+            self.__misses = 0
+
+
+_default_file_cache = FileCache()
+
+
+class _PrefixIndex(object):
+
+    def __init__(self, prefix):
+        """
+        The variables of an environment whose names start with a prefix.
+
+        The names of the last environment are kept, a dict environment with the same names is not scanned again.
+        os.environ is always scanned, it decodes every name while iterating, so comparing its names would cost
+        as much as the scan itself.
+        """
+        super().__init__()
+        self.__prefix = prefix
+        self.__names = frozenset()
+        self.__matches = ()
+
+    def lookup(self, environment):
+        """
+        :param environment: dict|os._Environ
+        :return: dict the matching variables and their values
+        """
+        if not isinstance(environment, dict):
+            return {key: environment[key] for key in environment if key.startswith(self.__prefix)}
+        if environment.keys() != self.__names:
+            self.__names = frozenset(environment)
+            self.__matches = tuple(key for key in self.__names if key.startswith(self.__prefix))
+        return {key: environment[key] for key in self.__matches}
+
+
+def _find_logger(name):
+    if name == '':
+        return logging.getLogger()
+    logger = logging.Logger.manager.loggerDict.get(name)
+    # loggerDict also holds placeholders for parents of loggers that were never requested themselves
+    return logger if isinstance(logger, logging.Logger) else None
+
+
+class _NewLoggerHook(object):
+
+    def __init__(self):
+        """
+        Sets configured log levels on loggers as soon as they are created.
+
+        While levels are expected, logging.Logger.manager.getLogger is replaced for the whole process.
+        The original is put back once every expected logger was created or forgotten.
+        """
+        super().__init__()
+        self.__levels = {}
+        self.__lock = Lock()
+        self.__get_logger = None
+        self.__installed = False
+        self.__shadowed = False
+
+    def expect(self, name, level):
+        with self.__lock:
+            self.__levels[name] = level
+            if not self.__installed:
+                manager = logging.Logger.manager
+                self.__shadowed = 'getLogger' in vars(manager)
+                self.__get_logger = manager.getLogger
+                manager.getLogger = self.__create_logger
+                self.__installed = True
+
+    def forget(self, name):
+        with self.__lock:
+            self.__levels.pop(name, None)
+            self.__uninstall_when_done()
+
+    def __uninstall_when_done(self):
+        if not self.__installed or len(self.__levels) > 0:
+            return
+        manager = logging.Logger.manager
+        # a hook installed on top of this one still calls it, it can't be removed without removing that one too
+        if manager.getLogger != self.__create_logger:
+            return
+        if self.__shadowed:
+            manager.getLogger = self.__get_logger
+        else:
+            del manager.getLogger
+        self.__installed = False
+
+    def __create_logger(self, name):
+        if name not in self.__levels:
+            return self.__get_logger(name)
+        logger = self.__get_logger(name)
+        with self.__lock:
+            level = self.__levels.pop(name, None)
+            self.__uninstall_when_done()
+        if level is not None:
+            logger.setLevel(level)
+        return logger
+
+
+_new_logger_hook = _NewLoggerHook()
+
+
 class Config(object):
 
-    def __init__(self, defer_raise=True, filename_variable=None, namespace=''):
+    def __init__(self, defer_raise=True, filename_variable=None, namespace='', file_cache=None, lazy=False,
+                 sources=None, warm_cache=None, validator_cache=None, validation_executor=None, interpolate=False):
         """
         Create a new Config object
 
         :param defer_raise: bool Whether to show errors as an aggregated report or fail on the first error found.
         :param filename_variable: str The variable name from which to get the file name
         :param namespace: str all environment variables are prefixed with this string
+        :param file_cache: FileCache cache for parsed config files, defaults to a cache shared by the whole process
+        :param lazy: bool load and validate each variable on its first get() instead of in declare()
+        :param sources: list(Source) layers to read raw values from, in order of precedence.
+                        Replaces the environment and the file of filename_variable.
+        :param warm_cache: WarmCache reuse values parsed and validated by an earlier process with the same inputs
+        :param validator_cache: ValidatorCache call validators once per distinct value,
+                                definitions declared with memoize=False are always validated
+        :param validation_executor: concurrent.futures.Executor parse and validate the keys of declare_many(), reload()
+                                    and lazy bulk loads concurrently. Use a ThreadPoolExecutor, definitions and the
+                                    environment are shared with the workers, not pickled.
+        :param interpolate: bool expand ${NAME} references to other environment or config file variables in the
+                            values of parse_*() definitions. $${NAME} is the literal text ${NAME}.
         """
         super().__init__()
-        self.__parsed_values = {}
-        self.__definitions = {}
-        self.__exceptions = []
+        if sources is not None and filename_variable is not None:
+            raise ValueError('filename_variable can not be combined with sources, add a FileSource instead')
+        self.__snapshot = Snapshot({}, ErrorRegistry(), None, None, [None], {}, {})
+        self.__write_lock = RLock()
+        self.__freeze_requested = False
+        self.__plans = {}
+        self.__outcomes = {}
+        self.__listeners = ()
         self.__defer_raise = defer_raise
+        self.__lazy = lazy
         self.__file_contents = {}
         self.__filename_variable = filename_variable
         self.__filename = None
         self.__namespace = namespace
-        self.__tags = {}
         self.__logger = logging.getLogger(MODULE_NAME)
         self.__log_parsing_active = False
+        self.__configure_new_loggers = False
+        self.__log_levels = {}
+        self.__log_level_errors = {}
+        self.__log_level_index = None
+        self.__file_cache = file_cache if file_cache is not None else _default_file_cache
+        self.__stats = None
+        self.__sources = tuple(sources) if sources is not None else None
+        self.__warm_cache = warm_cache
+        self.__validator_cache = validator_cache
+        self.__validation_executor = validation_executor
+        self.__interpolator = Interpolator() if interpolate else None
+        self.__references = set()
 
     @property
     def logger(self):
         return self.__logger
 
+    @property
+    def file_cache(self):
+        return self.__file_cache
+
+    @property
+    def namespace(self):
+        return self.__namespace
+
+    @property
+    def errors(self):
+        return self.__snapshot.errors
+
+    @property
+    def warm_cache(self):
+        return self.__warm_cache
+
+    @property
+    def validator_cache(self):
+        return self.__validator_cache
+
+    @property
+    def interpolator(self):
+        """
+        :return: Interpolator or None if interpolation is disabled
+        """
+        return self.__interpolator
+
+    @property
+    def sources(self):
+        """
+        :return: tuple(Source) the explicit sources or None if the environment and config file are used
+        """
+        return self.__sources
+
+    @property
+    def provenance(self):
+        """
+        the source of every loaded environment variable, only recorded when Config has explicit sources
+        :return: dict source names by environment variable name
+        """
+        return self.__snapshot.provenance
+
+    @property
+    def snapshot(self):
+        """
+        the currently published state.
+        Snapshots are never changed, declare() and reload() publish a new one.
+        :return: Snapshot
+        """
+        return self.__snapshot
+
     def declare(self, key, definition, tags=('default',), current_tag='default'):
         """
         declare config options
@@ -335,103 +1138,589 @@ class Config(object):
         """
 
         key = self.__add_namespace(key)
+        plan = _compile(key, definition, tags, self.__validator_cache)
+        with self.__write_lock:
+            self.__plans[key] = (plan, current_tag)
+            if self.__lazy:
+                self.__defer([(plan, current_tag)])
+            else:
+                self.__load([(plan, current_tag)], environ)
 
-        if current_tag in tags and current_tag not in self.__file_contents:
-            try:
-                filename = path.join(getcwd(), environ[self.__filename_variable])
-                try:
-                    self.__file_contents = _read_file(filename)
-                    self.__filename = filename
-                except FileNotFoundError as e:
-                    self.logger.warning(
-                        'Config file not found. Ignoring. {{"filename_variable": "{0}", "filename": "{1}"}}'.format(
-                            self.__filename_variable,
-                            e.filename
-                        )
-                    )
-            except (KeyError, TypeError):
-                pass
-        elif current_tag not in self.__tags:
-            self.__file_contents = {}
-        self.__definitions[key] = definition
-        if isinstance(definition, dict):
-            self.__parsed_values[key], exceptions = \
-                _parse_dict(key, definition, self.__defer_raise, tags, current_tag, self.__file_contents)
-            self.__exceptions = self.__exceptions + exceptions
-        else:
-            try:
-                self.__parsed_values[key] = definition(key.upper(), self.__file_contents)
-            except BaseException as e:
-                if current_tag not in tags:
-                    self.__parsed_values[key] = ConfigNotInCurrentTagError(key, current_tag)
-                elif self.__defer_raise:
-                    self.__exceptions.append(e)
-                else:
-                    raise e
+    def declare_many(self, definitions, tags=('default',), current_tag='default'):
+        """
+        declare multiple config options at once.
+        The environment and the config file are read once for all definitions.
+        :param definitions: dict(str, Any) definitions by key
+        :param tags: set(str) list of tags that these variables should exist in
+        :param current_tag: str the tag to declare these variables for
+        :return: None
+        """
+        plans = [(_compile(self.__add_namespace(key), definition, tags, self.__validator_cache), current_tag)
+                 for key, definition in definitions.items()]
+        with self.__write_lock:
+            for plan in plans:
+                self.__plans[plan[0].key] = plan
+            if self.__lazy:
+                self.__defer(plans)
+            else:
+                self.__load(plans, environ.copy())
+                self.__save_warm_cache()
 
-    def apply_log_levels(self):
-        self.__log_parsing_active = True
-        logger = None
+    @classmethod
+    def from_schema(cls, definitions, tags=('default',), current_tag='default', **kwargs):
+        """
+        Create a new Config object and declare all definitions in one pass
+        :param definitions: dict(str, Any) definitions by key
+        :param tags: set(str) list of tags that these variables should exist in
+        :param current_tag: str the tag to declare these variables for
+        :param kwargs: arguments passed to Config()
+        :return: Config
+        """
+        config = cls(**kwargs)
+        config.declare_many(definitions, tags, current_tag)
+        return config
+
+    def apply_log_levels(self, configure_new_loggers=False):
+        """
+        set the levels of python loggers from the LOG_LEVEL variables.
+        Later calls and reloads only apply variables whose value changed.
+        :param configure_new_loggers: bool instead of reporting loggers that do not exist yet,
+                                      set their level as soon as they are created. Until they are,
+                                      logging.Logger.manager.getLogger is replaced for the whole process.
+        :return: None
+        """
+        with self.__write_lock:
+            self.__log_parsing_active = True
+            self.__configure_new_loggers = configure_new_loggers
+            errors = self.__snapshot.errors.copy()
+            self.__apply_log_levels(errors, environ)
+            self.__publish(self.__snapshot.values, errors)
+
+    def __apply_log_levels(self, errors, environment):
         log_level_prefix = self.__add_namespace('LOG_LEVEL')
+        errors.discard(log_level_prefix)
+        if self.__log_level_index is None:
+            self.__log_level_index = _PrefixIndex(log_level_prefix)
+        log_levels = self.__log_level_index.lookup(environment)
+        previous = self.__log_levels
+        previous_errors = self.__log_level_errors
+        # filled while applying, so variables skipped by a raised error are applied again by the next call
+        applied = self.__log_levels = {}
+        self.__log_level_errors = {}
+
+        for key in previous.keys() - log_levels.keys():
+            _new_logger_hook.forget(key[len(log_level_prefix) + 1:].lower())
+
+        for key, log_level in log_levels.items():
+            applied[key] = log_level
+            ex = previous_errors.get(key)
+            if previous.get(key) == log_level and (ex is None or isinstance(ex, ConfigMissingError)):
+                # unchanged, only loggers that did not exist yet are looked up again
+                if ex is not None:
+                    self.__log_level_error(errors, key, ex)
+                continue
 
-        for key in [key for key in environ if key.startswith(log_level_prefix)]:
-            log_levels = environ[key]
             logger_name = key[len(log_level_prefix) + 1:].lower()
-            try:
-                if logger_name == '':
-                    logger = logging.getLogger()
-                else:
-                    logger = logging.Logger.manager.loggerDict[logger_name]
-            except KeyError:
-                ex = ConfigError('logger does not exist: {}'.format(logger_name))
-                if self.__defer_raise:
-                    self.__exceptions.append(ex)
-                else:
-                    raise ex
+            python_log_level = LOG_LEVEL_DEFINITIONS.get(log_level.lower())
+            if python_log_level is None:
+                self.__log_level_error(errors, key, ConfigMissingError(self.__remove_namespace('LOG_LEVELS')))
+                continue
 
-            if logger:
-                try:
-                    python_log_level = LOG_LEVEL_DEFINITIONS[log_levels.lower()]
-                    logger.setLevel(python_log_level)
-                except KeyError:
-                    ex = ConfigMissingError(self.__remove_namespace('LOG_LEVELS'))
-                    if self.__defer_raise:
-                        self.__exceptions.append(ex)
-                    else:
-                        raise ex
+            logger = _find_logger(logger_name)
+            if logger is not None:
+                _new_logger_hook.forget(logger_name)
+                logger.setLevel(python_log_level)
+            elif self.__configure_new_loggers:
+                _new_logger_hook.expect(logger_name, python_log_level)
+            else:
+                self.__log_level_error(errors, key, ConfigError('logger does not exist: {}'.format(logger_name)))
 
+    def __log_level_error(self, errors, key, ex):
+        self.__log_level_errors[key] = ex
+        if not self.__defer_raise:
+            raise ex
+        errors.add(self.__add_namespace('LOG_LEVEL'), ex)
 
     def reload(self):
-        for key, definition in self.__definitions.items():
-            self.declare(key, definition)
-        if self.__log_parsing_active:
-            self.apply_log_levels()
+        """
+        load all declared variables again.
+        Only variables whose raw value in the environment or the config file changed are parsed and validated again.
+        :return: frozenset(str) the names of the environment variables that changed
+        """
+        stats = self.__stats
+        start = perf_counter()
+        with self.__write_lock:
+            pending = self.__snapshot.pending
+            plans = [plan for key, plan in self.__plans.items() if key not in pending]
+            environment = environ.copy()
+            changes = self.__load(plans, environment, incremental=True)
+            self.__save_warm_cache()
+            if self.__log_parsing_active:
+                errors = self.__snapshot.errors.copy()
+                self.__apply_log_levels(errors, environment)
+                self.__publish(self.__snapshot.values, errors)
+        if stats is not None:
+            stats.record_reload(perf_counter() - start, changes)
+        self.__notify(changes)
+        return changes
+
+    def switch_tag(self, tag):
+        """
+        make tag the current tag of all declared variables.
+        Only variables that become active or inactive are loaded or dropped, all others are left as they are.
+        :param tag: str
+        :return: frozenset(str) the names of the environment variables that changed
+        """
+        with self.__write_lock:
+            pending = self.__snapshot.pending
+            switched = []
+            retagged = []
+            for key, (plan, current_tag) in self.__plans.items():
+                if current_tag == tag:
+                    continue
+                self.__plans[key] = (plan, tag)
+                if (current_tag in plan.tags) != (tag in plan.tags):
+                    switched.append((plan, tag))
+                elif key in pending:
+                    retagged.append((plan, tag))
+            if self.__lazy:
+                if len(switched) > 0 or len(retagged) > 0:
+                    self.__defer(switched + retagged)
+                changes = frozenset(entry.env_key for plan, current_tag in switched for entry in plan.entries)
+            elif len(switched) == 0:
+                return frozenset()
+            else:
+                changes = self.__load(switched, environ.copy(), incremental=True)
+                self.__save_warm_cache()
+        self.__notify(changes)
+        return changes
+
+    async def areload(self, executor=None):
+        """
+        reload() in an executor, so reading files and running validators does not block the event loop
+        :param executor: concurrent.futures.Executor defaults to the loop's default executor
+        :return: frozenset(str) the names of the environment variables that changed
+        """
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(executor, self.reload)
+
+    def watch(self, interval=None, executor=None):
+        """
+        iterate asynchronously over the changes of every reload()
+        :param interval: float if set, reload every interval seconds while waiting for changes
+        :param executor: concurrent.futures.Executor executor for the periodic reloads
+        :return: ChangeStream
+        """
+        from .aio import ChangeStream
+        return ChangeStream(self, interval, executor)
+
+    def add_listener(self, listener):
+        """
+        call listener with the changes of every reload() that changed something
+        :param listener: callable
+        :return: None
+        """
+        with self.__write_lock:
+            self.__listeners = self.__listeners + (listener,)
+
+    def remove_listener(self, listener):
+        with self.__write_lock:
+            self.__listeners = tuple(registered for registered in self.__listeners if registered != listener)
+
+    def watch_file(self, interval=1.0, debounce=0.2, backend='auto', on_reload=None):
+        """
+        reload in the background whenever the config file changes
+        :param interval: float seconds between checks for changes
+        :param debounce: float seconds the file has to stay unchanged before reloading
+        :param backend: str 'poll', 'inotify' or 'auto'
+        :param on_reload: callable called with the changes returned by reload()
+        :return: FileWatcher the running watcher, call stop() on it to stop watching
+        """
+        try:
+            filename = path.join(getcwd(), environ[self.__filename_variable])
+        except (KeyError, TypeError):
+            raise ConfigError('no config file to watch, filename_variable "{}" is not set'.format(
+                self.__filename_variable))
+        watcher = FileWatcher(self, filename, interval, debounce, backend, on_reload)
+        watcher.start()
+        return watcher
+
+    def validate(self):
+        """
+        raise an AggregateConfigError if any errors occurred while loading variables.
+        In lazy mode only variables that were already loaded are checked.
+        :return: None
+        """
+        snapshot = self.__snapshot
+        if len(snapshot.errors) > 0:
+            raise AggregateConfigError(snapshot.errors, snapshot.filename)
+
+    def validate_all(self):
+        """
+        load all variables that were not loaded yet and raise an AggregateConfigError if any errors occurred
+        :return: None
+        """
+        self.__load_pending()
+        self.__save_warm_cache()
+        self.validate()
+
+    def freeze(self):
+        """
+        validate all declared variables and precompute the values returned by get().
+        While frozen get() is a single dict lookup. The frozen values are recomputed on declare() and reload().
+        Like any other error, get() on an undeclared key drops them, later calls raise as they do without freeze().
+        :return: None
+        """
+        with self.__write_lock:
+            self.validate_all()
+            self.__freeze_requested = True
+            self.__publish(self.__snapshot.values, self.__snapshot.errors)
+
+    @property
+    def values(self):
+        """
+        all loaded values as read-only objects, e.g. config.values.database.user
+        The objects are built once per snapshot and replaced on declare() and reload().
+        :return: ConfigValues
+        """
+        snapshot = self.__snapshot
+        if len(snapshot.pending) > 0:
+            self.__load_pending()
+            snapshot = self.__snapshot
+        if self.__defer_raise and len(snapshot.errors) > 0:
+            raise AggregateConfigError(snapshot.errors, snapshot.filename)
+        value_objects = snapshot.value_objects
+        if value_objects[0] is None:
+            value_objects[0] = _build_value_object({
+                self.__remove_namespace(key): self.__inactive_error(key) if value is _INACTIVE else value
+                for key, value in snapshot.values.items()
+            })
+        return value_objects[0]
+
+    def enable_stats(self, callback=None):
+        """
+        start recording lookups, parse and validation times, file reads, reloads and get() calls
+        :param callback: callable called with the event name and event data for each 'parse', 'file_read'
+                         and 'reload' event
+        :return: None
+        """
+        self.__stats = ConfigStats(callback)
+        self.get = self.__counted_get
+
+    def disable_stats(self):
+        self.__stats = None
+        self.__dict__.pop('get', None)
+
+    def stats(self):
+        """
+        :return: dict the recorded stats or None if stats are not enabled
+        """
+        stats = self.__stats
+        if stats is None:
+            return None
+        return stats.as_dict()
+
+    def view(self, namespace):
+        """
+        a namespaced view of this config, e.g. for a library that declares its own variables.
+        Views share the sources, caches and snapshots of this config and only report errors of their namespace.
+        :param namespace: str prefixed to all keys declared and read through the view
+        :return: ConfigView
+        """
+        return ConfigView(self, namespace, self.__scoped_get)
+
+    def __counted_get(self, key):
+        stats = self.__stats
+        if stats is not None:
+            stats.record_get(key)
+        return Config.get(self, key)
+
+    def __scoped_get(self, key, scope):
+        stats = self.__stats
+        if stats is not None:
+            stats.record_get(key)
+        return self.__get(key, scope)
 
     def get(self, key):
-        key = self.__add_namespace(key)
+        return self.__get(key)
+
+    def __get(self, key, scope=None):
+        snapshot = self.__snapshot
+        if snapshot.frozen is not None:
+            try:
+                return snapshot.frozen[key]
+            except KeyError:
+                pass
+
+        namespaced_key = self.__add_namespace(key)
+        if namespaced_key in snapshot.pending:
+            self.__load_pending(namespaced_key)
+            return self.__get(key, scope)
+
+        key = namespaced_key
         value = None
         try:
-            value = self.__parsed_values[key]
+            value = snapshot.values[key]
         except KeyError:
             ex = ConfigMissingError(self.__remove_namespace(key))
-            if self.__defer_raise:
-                self.__exceptions.append(ex)
-            else:
+            if not self.__defer_raise:
                 raise ex
+            snapshot = self.__record_missing(key, ex)
+
+        if value is _INACTIVE:
+            raise self.__inactive_error(key)
 
-        if value and isinstance(value, dict):
+        if isinstance(value, dict):
             for key, val in value.items():
                 if isinstance(val, BaseException):
                     raise val
 
-        if value and isinstance(value, BaseException):
+        if isinstance(value, BaseException):
             raise value
 
-        if self.__defer_raise and len(self.__exceptions) > 0:
-            raise AggregateConfigError(self.__exceptions, self.__filename)
+        if self.__defer_raise and len(snapshot.errors) > 0:
+            errors = snapshot.errors if scope is None else snapshot.errors.scoped(self.__add_namespace(scope) + '_')
+            if len(errors) > 0:
+                raise AggregateConfigError(errors, snapshot.filename)
 
         return value
 
+    def __record_missing(self, key, ex):
+        """
+        publish the error of a variable that was never declared, published snapshots are never changed
+        :return: Snapshot the snapshot with the error
+        """
+        with self.__write_lock:
+            errors = self.__snapshot.errors.copy()
+            errors.add(key, ex)
+            self.__publish(self.__snapshot.values, errors)
+            return self.__snapshot
+
+    def __load(self, plans, environment, incremental=False):
+        values = None
+        errors = None
+        file_contents = None
+        provenance = None
+        changes = []
+        inactive = []
+        active = []
+        for plan, current_tag in plans:
+            if current_tag in plan.tags:
+                active.append((plan, current_tag))
+            elif not incremental or self.__snapshot.values.get(plan.key, _UNKNOWN) is not _INACTIVE:
+                inactive.append(plan)
+
+        if inactive:
+            values = dict(self.__snapshot.values)
+            errors = self.__snapshot.errors.copy()
+            for plan in inactive:
+                values[plan.key] = _INACTIVE
+                errors.discard(plan.key)
+                self.__outcomes.pop(plan.key, None)
+                changes.extend(entry.env_key for entry in plan.entries)
+
+        if self.__sources is not None and active:
+            environment, provenance = self.__merge_sources(active)
+            file_contents = environment
+        unresolved = None
+        if self.__interpolator is not None and active:
+            if file_contents is None:
+                file_contents = self.__load_file()
+            # custom definitions keep reading the raw file contents
+            environment, unresolved = self.__interpolate(active, environment, file_contents, provenance)
+        jobs = []
+        for plan, current_tag in active:
+            if file_contents is None:
+                contents = file_contents = self.__load_file()
+            else:
+                contents = file_contents
+
+            previous = None
+            if incremental and plan.key in self.__outcomes and self.__outcomes[plan.key][0] is plan:
+                previous = self.__outcomes[plan.key][1]
+            cached = None
+            key_fingerprint = None
+            if self.__warm_cache is not None and previous is None:
+                raws = _plan_raws(plan, contents, environment)
+                if raws is not None:
+                    key_fingerprint = fingerprint(plan, current_tag, raws)
+                    cached_values = self.__warm_cache.get(plan.key, key_fingerprint)
+                    if cached_values is not None:
+                        cached = tuple(Outcome(raw, value, None) for raw, value in zip(raws, cached_values))
+            jobs.append((plan, current_tag, contents, previous, cached, key_fingerprint))
+
+        for (plan, current_tag, contents, previous, cached, key_fingerprint), result in zip(
+                jobs, self.__run_plans(jobs, environment, provenance, unresolved)):
+            if key_fingerprint is not None and cached is None and len(result.exceptions) == 0:
+                self.__warm_cache.put(plan.key, key_fingerprint, [outcome.value for outcome in result.outcomes])
+            self.__outcomes[plan.key] = (plan, result.outcomes)
+            if result.value is _UNCHANGED:
+                continue
+
+            if values is None:
+                values = dict(self.__snapshot.values)
+                errors = self.__snapshot.errors.copy()
+            if result.value is not _FAILED:
+                values[plan.key] = result.value
+            elif values.get(plan.key) is _INACTIVE:
+                del values[plan.key]
+            # a declaration replaces the errors of earlier declarations of the key
+            errors.replace(plan.key, result.exceptions)
+            changes.extend(result.changes)
+
+        if values is not None:
+            pending = self.__snapshot.pending
+            if len(pending) > 0:
+                loaded = set(plan.key for plan, current_tag in plans)
+                pending = {key: plan for key, plan in pending.items() if key not in loaded}
+            self.__publish(values, errors, pending, provenance)
+        elif provenance is not None and provenance != self.__snapshot.provenance:
+            # the same raw value may now come from another source
+            self.__publish(self.__snapshot.values, self.__snapshot.errors, provenance=provenance)
+        return frozenset(changes)
+
+    def __run_plans(self, jobs, environment, provenance, unresolved):
+        def run(plan, current_tag, contents, previous, cached, key_fingerprint):
+            return _load_plan(
+                plan, current_tag, self.__defer_raise, contents, environment, previous, self.__stats, provenance,
+                cached, unresolved
+            )
+
+        executor = self.__validation_executor
+        if executor is None or len(jobs) < 2:
+            return [run(*job) for job in jobs]
+        futures = [executor.submit(run, *job) for job in jobs]
+        # results are collected in declaration order, so the first error raised and the report do not depend on timing
+        return [future.result() for future in futures]
+
+    def __interpolate(self, plans, environment, file_contents, provenance):
+        """
+        expand the references in the raw values of the plans.
+        With sources, the sources are asked for the referenced variables as well, the environment is the merged index.
+        :return: tuple(dict, dict) an index of the expanded values and the errors of values that could not be expanded
+        """
+        names = [entry.env_key for plan, current_tag in plans for entry in plan.entries if entry.parser is not None]
+        if self.__sources is None:
+            values, errors = self.__interpolator.resolve(names, partial(_lookup, file_contents=file_contents,
+                                                                        environment=environment))
+        else:
+            requested = set(names)
+            # variables referenced in earlier loads are merged up front, so usually one pass is enough
+            references = self.__references.difference(requested)
+            looked_up = set()
+
+            def lookup(name):
+                looked_up.add(name)
+                return environment.get(name)
+
+            while True:
+                if len(references) > 0:
+                    index, sources = _merge_sources(self.__sources, references)
+                    environment.update(index)
+                    provenance.update(sources)
+                    requested.update(references)
+                looked_up.clear()
+                values, errors = self.__interpolator.resolve(names, lookup)
+                references = looked_up.difference(requested)
+                if len(references) == 0:
+                    break
+            self.__references.update(looked_up.difference(names))
+        for name in errors:
+            # keep the raw value, so the variable is reported as invalid and not as missing
+            values[name] = _lookup(name, file_contents, environment)
+        return values, errors
+
+    def __notify(self, changes):
+        if len(changes) > 0:
+            for listener in self.__listeners:
+                try:
+                    listener(changes)
+                except BaseException:
+                    self.logger.exception('Config change listener failed.')
+
+    def __merge_sources(self, plans):
+        keys = set()
+        for plan, current_tag in plans:
+            keys.update(entry.env_key for entry in plan.entries)
+        index, provenance = _merge_sources(self.__sources, keys)
+        merged = {key: source for key, source in self.__snapshot.provenance.items() if key not in keys}
+        merged.update(provenance)
+        return index, merged
+
+    def __save_warm_cache(self):
+        if self.__warm_cache is not None:
+            try:
+                self.__warm_cache.save()
+            except OSError:
+                self.logger.exception('Writing the warm cache failed. {{"filename": "{0}"}}'.format(
+                    self.__warm_cache.filename
+                ))
+
+    def __defer(self, plans):
+        values = dict(self.__snapshot.values)
+        errors = self.__snapshot.errors.copy()
+        pending = dict(self.__snapshot.pending)
+        for plan, current_tag in plans:
+            values.pop(plan.key, None)
+            errors.discard(plan.key)
+            self.__outcomes.pop(plan.key, None)
+            pending[plan.key] = (plan, current_tag)
+        self.__publish(values, errors, pending)
+
+    def __load_pending(self, key=None):
+        with self.__write_lock:
+            pending = self.__snapshot.pending
+            if key is None:
+                plans = list(pending.values())
+            elif key in pending:
+                plans = [pending[key]]
+            else:
+                return
+            if len(plans) > 0:
+                self.__load(plans, environ.copy() if len(plans) > 1 else environ)
+
+    def __publish(self, values, errors, pending=None, provenance=None):
+        if pending is None:
+            pending = self.__snapshot.pending
+        if provenance is None:
+            provenance = self.__snapshot.provenance
+        frozen = self.__frozen_values(values, errors) if self.__freeze_requested else None
+        self.__snapshot = Snapshot(values, errors, frozen, self.__filename, [None], pending, provenance)
+
+    def __frozen_values(self, values, errors):
+        if len(errors) > 0:
+            return None
+        frozen = {}
+        for key, value in values.items():
+            if value is _INACTIVE or isinstance(value, BaseException):
+                continue
+            if isinstance(value, dict) and any(isinstance(val, BaseException) for val in value.values()):
+                continue
+            frozen[self.__remove_namespace(key)] = value
+        return frozen
+
+    def __load_file(self):
+        try:
+            filename = path.join(getcwd(), environ[self.__filename_variable])
+        except (KeyError, TypeError):
+            return self.__file_contents
+        try:
+            self.__file_contents, cached = self.__file_cache.read_cached(filename)
+            self.__filename = filename
+            if self.__stats is not None:
+                self.__stats.record_file_read(filename, cached)
+        except FileNotFoundError as e:
+            self.logger.warning(
+                'Config file not found. Ignoring. {{"filename_variable": "{0}", "filename": "{1}"}}'.format(
+                    self.__filename_variable,
+                    e.filename
+                )
+            )
+        return self.__file_contents
+
+    def __inactive_error(self, key):
+        return ConfigNotInCurrentTagError(key, self.__plans[key][1])
+
     def __add_namespace(self, key):
         if self.__namespace:
             return '{}_{}'.format(self.__namespace, key)
@@ -441,3 +1730,79 @@ class Config(object):
         if self.__namespace and key.startswith(self.__namespace + '_'):
             return key[len(self.__namespace) + 1:]
         return key
+
+
+class ConfigView(object):
+
+    def __init__(self, config, namespace, get):
+        """
+        A namespaced view of a Config, created with Config.view().
+
+        Keys are prefixed with the namespace and passed on, all values and errors stay in the parent config.
+        get() and validate() only report errors of variables declared in the namespace.
+
+        :param config: Config
+        :param namespace: str
+        :param get: callable looks up a key of the parent config and scopes errors to a prefix
+        """
+        super().__init__()
+        self.__config = config
+        self.__namespace = namespace
+        self.__get = get
+
+    @property
+    def config(self):
+        return self.__config
+
+    @property
+    def namespace(self):
+        return self.__namespace
+
+    @property
+    def errors(self):
+        """
+        :return: ErrorRegistry the errors of the variables declared in the namespace
+        """
+        return self.__config.errors.scoped(self.__config_key(self.__namespace) + '_')
+
+    def declare(self, key, definition, tags=('default',), current_tag='default'):
+        """
+        declare a config option in the namespace, see Config.declare()
+        :return: None
+        """
+        self.__config.declare(self.__add_namespace(key), definition, tags, current_tag)
+
+    def declare_many(self, definitions, tags=('default',), current_tag='default'):
+        """
+        declare multiple config options in the namespace at once, see Config.declare_many()
+        :return: None
+        """
+        self.__config.declare_many(
+            {self.__add_namespace(key): definition for key, definition in definitions.items()}, tags, current_tag
+        )
+
+    def get(self, key):
+        return self.__get(self.__add_namespace(key), self.__namespace)
+
+    def validate(self):
+        """
+        raise an AggregateConfigError if any errors occurred while loading variables of the namespace
+        :return: None
+        """
+        errors = self.errors
+        if len(errors) > 0:
+            raise AggregateConfigError(errors, self.__config.snapshot.filename)
+
+    def view(self, namespace):
+        """
+        :param namespace: str
+        :return: ConfigView a view of a namespace nested in this one
+        """
+        return ConfigView(self.__config, self.__add_namespace(namespace), self.__get)
+
+    def __add_namespace(self, key):
+        return '{}_{}'.format(self.__namespace, key)
+
+    def __config_key(self, key):
+        namespace = self.__config.namespace
+        return '{}_{}'.format(namespace, key) if namespace else key
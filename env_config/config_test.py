@@ -1,17 +1,31 @@
 import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event, Thread
 from time import sleep
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from os import environ
 from testfixtures import LogCapture
 
 import re
 import snapshottest
+import subprocess
+import sys
 from ddt import ddt, data
 from validators import email, ValidationFailure
 
 from env_config import Config, ConfigValueError, parse_str, parse_int, parse_float, parse_str_list, \
     parse_int_list, parse_float_list, parse_bool, parse_bool_list, ConfigParseError, ConfigMissingError, \
-    AggregateConfigError, ConfigNotInCurrentTagError, ConfigFileEmptyError, ConfigError
+    AggregateConfigError, ConfigNotInCurrentTagError, ConfigFileEmptyError, ConfigError, FileCache, \
+    ErrorRegistry, ValidatorCache, parse_int_array, parse_float_array, ConfigView, DefaultsSource, \
+    EnvironSource
+from env_config.config import _INACTIVE, _compile, _load_plan
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def delete_environment_variable(name):
@@ -445,6 +459,97 @@ class ListValuesTest(ConfigTestCase):
             self.config.declare('key', parse_bool_list())
 
 
+class ArrayValuesTests(object):
+    use_numpy = False
+
+    def setUp(self):
+        super().setUp()
+        self.config = Config(defer_raise=False)
+
+    def declare(self, definition, raw):
+        environ['KEY'] = raw
+        self.config.declare('key', definition)
+        return self.config.get('key')
+
+    def test_int_array(self):
+        result = self.declare(parse_int_array(use_numpy=self.use_numpy), '1, 2 ,3,-4')
+        self.assertEqual([1, 2, 3, -4], result.tolist())
+
+    def test_float_array(self):
+        result = self.declare(parse_float_array(use_numpy=self.use_numpy), '1.5,2,-3e2')
+        self.assertEqual([1.5, 2.0, -300.0], result.tolist())
+
+    def test_different_separator_and_typecode(self):
+        result = self.declare(parse_int_array(separator=';', typecode='i', use_numpy=self.use_numpy), '1;2')
+        self.assertEqual([1, 2], result.tolist())
+        self.assertEqual(4, memoryview(result).itemsize)
+
+    def test_read_only(self):
+        result = self.declare(parse_int_array(use_numpy=self.use_numpy), '1,2,3')
+        view = memoryview(result)
+        self.assertTrue(view.readonly)
+        with self.assertRaises((TypeError, ValueError)):
+            result[0] = 5
+
+    def test_validate_whole_array(self):
+        validated = []
+        self.declare(parse_int_array(validator=lambda values: validated.append(values.tolist()),
+                                     use_numpy=self.use_numpy), '1,2')
+        self.assertEqual([[1, 2]], validated)
+
+    def test_return_default(self):
+        delete_environment_variable('KEY')
+        self.config.declare('key', parse_int_array(default=(1, 2), use_numpy=self.use_numpy))
+        self.assertEqual((1, 2), self.config.get('key'))
+
+    def test_raise_parse_errors(self):
+        for raw in ('1,x,3', '1.5,2', '', '1,,2', '1,2,', '99999999999999999999'):
+            with self.assertRaises(ConfigParseError, msg=raw):
+                self.declare(parse_int_array(use_numpy=self.use_numpy), raw)
+
+    def test_raise_overflow_errors(self):
+        for typecode, raw in (('b', '300'), ('b', '1,-129'), ('h', '70000'), ('i', '3000000000'),
+                              ('B', '-1'), ('H', '1,65536'), ('q', '9223372036854775808'), ('Q', '-5')):
+            with self.assertRaises(ConfigParseError, msg='{} {}'.format(typecode, raw)) as context:
+                self.declare(parse_int_array(typecode=typecode, use_numpy=self.use_numpy), raw)
+            self.assertIsInstance(context.exception.previous_error, OverflowError)
+
+    def test_values_at_the_limits_of_narrow_types(self):
+        result = self.declare(parse_int_array(typecode='b', use_numpy=self.use_numpy), '127,-128,0')
+        self.assertEqual([127, -128, 0], result.tolist())
+        result = self.declare(parse_int_array(typecode='H', use_numpy=self.use_numpy), '65535,0')
+        self.assertEqual([65535, 0], result.tolist())
+
+    def test_memoize_whole_arrays(self):
+        self.config = Config(validator_cache=ValidatorCache())
+        validated = []
+        self.declare(parse_int_array(validator=validated.append, use_numpy=self.use_numpy), '1,2')
+        self.declare(parse_int_array(validator=validated.append, use_numpy=self.use_numpy), '1,2')
+        self.assertEqual(2, len(validated))
+
+
+class ArrayValuesTest(ArrayValuesTests, ConfigTestCase):
+    def test_memoryview_without_numpy(self):
+        result = self.declare(parse_float_array(use_numpy=False), '1,2')
+        self.assertIsInstance(result, memoryview)
+        self.assertEqual('d', result.format)
+
+
+@skipIf(numpy is None, 'numpy is not installed')
+class NumpyArrayValuesTest(ArrayValuesTests, ConfigTestCase):
+    use_numpy = True
+
+    def test_numpy_array(self):
+        result = self.declare(parse_float_array(), '1,2')
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(numpy.float64, result.dtype)
+
+    def test_numpy_is_imported_lazily(self):
+        code = 'import sys, env_config; print("numpy" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(__file__)))
+        self.assertEqual(b'False', output.strip())
+
+
 class FlatDictValuesTest(ConfigTestCase):
     def setUp(self):
         super().setUp()
@@ -621,6 +726,640 @@ class ReloadTest(ConfigTestCase):
         self.assertEqual(value3, 'new value')
 
 
+    def test_reload_keeps_namespace_and_tags(self):
+        environ['NAMESPACE_KEY'] = 'original value'
+        config = Config(namespace='namespace', defer_raise=False)
+        config.declare('key', parse_str(), ('test',), 'test')
+        environ['NAMESPACE_KEY'] = 'new value'
+
+        config.reload()
+
+        self.assertEqual('new value', config.get('key'))
+
+
+class IncrementalReloadTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        delete_environment_variable('KEY_ONE')
+        delete_environment_variable('KEY_TWO')
+
+    def test_reload_without_changes(self):
+        environ['KEY'] = 'value'
+        validated = []
+        self.config.declare('key', parse_str(validator=validated.append))
+
+        changes = self.config.reload()
+
+        self.assertEqual(frozenset(), changes)
+        self.assertEqual(['value'], validated)
+
+    def test_reload_only_parses_changed_variables(self):
+        environ['KEY_ONE'] = '1'
+        environ['KEY_TWO'] = '2'
+        validated = []
+        self.config.declare('key', {'one': parse_int(validator=validated.append),
+                                    'two': parse_int(validator=validated.append)})
+        environ['KEY_TWO'] = '22'
+
+        changes = self.config.reload()
+
+        self.assertEqual(frozenset(['KEY_TWO']), changes)
+        self.assertEqual([1, 2, 22], validated)
+        self.assertEqual({'one': 1, 'two': 22}, self.config.get('key'))
+
+    def test_reload_reports_removed_variables(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str('default'))
+        del environ['KEY']
+
+        changes = self.config.reload()
+
+        self.assertEqual(frozenset(['KEY']), changes)
+        self.assertEqual('default', self.config.get('key'))
+
+    def test_reload_reports_custom_definitions_when_their_value_changes(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', lambda key, file_contents: environ[key])
+
+        self.assertEqual(frozenset(), self.config.reload())
+        environ['KEY'] = 'new value'
+        self.assertEqual(frozenset(['KEY']), self.config.reload())
+
+    def test_reload_keeps_errors_of_unchanged_variables(self):
+        config = Config(defer_raise=True)
+        config.declare('key', parse_int())
+
+        config.reload()
+
+        self.assertEqual(1, len(config.errors))
+
+
+class ConfigValuesTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        environ['NAMESPACE_DATABASE_USER'] = 'user'
+        environ['NAMESPACE_DATABASE_POOL_SIZE'] = '5'
+        environ['NAMESPACE_HOSTS'] = 'a,b'
+        self.config = Config(namespace='namespace')
+        self.config.declare('database', {'user': parse_str(), 'pool': {'size': parse_int()}})
+        self.config.declare('hosts', parse_str_list())
+
+    def test_attribute_access(self):
+        values = self.config.values
+
+        self.assertEqual('user', values.database.user)
+        self.assertEqual(5, values.database.pool.size)
+        self.assertEqual(['a', 'b'], values.hosts)
+
+    def test_values_use_slots(self):
+        self.assertFalse(hasattr(self.config.values.database, '__dict__'))
+
+    def test_values_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.config.values.database.user = 'other'
+        with self.assertRaises(AttributeError):
+            del self.config.values.hosts
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.config.values.undeclared
+
+    def test_values_are_replaced_on_reload(self):
+        values = self.config.values
+        environ['NAMESPACE_DATABASE_USER'] = 'other'
+
+        self.config.reload()
+
+        self.assertEqual('user', values.database.user)
+        self.assertEqual('other', self.config.values.database.user)
+        self.assertIs(self.config.values, self.config.values)
+
+    def test_raise_for_variables_from_another_tag(self):
+        self.config.declare('optional', {'value': parse_str()}, ('default',), 'other')
+        with self.assertRaises(ConfigNotInCurrentTagError):
+            self.config.values.optional.value
+
+    def test_raise_aggregated_errors(self):
+        self.config.declare('missing', parse_str())
+        with self.assertRaises(AggregateConfigError):
+            self.config.values
+
+
+class LazyConfigTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        delete_environment_variable('OTHER_KEY')
+        self.validated = []
+        self.config = Config(lazy=True)
+
+    def validator(self, value):
+        self.validated.append(value)
+
+    def test_load_on_first_get(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str(validator=self.validator))
+        self.assertEqual([], self.validated)
+
+        self.assertEqual('value', self.config.get('key'))
+        self.assertEqual('value', self.config.get('key'))
+        self.assertEqual(['value'], self.validated)
+
+    def test_memoize_until_reload(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+        self.config.get('key')
+        environ['KEY'] = 'new value'
+        self.assertEqual('value', self.config.get('key'))
+
+        self.config.reload()
+
+        self.assertEqual('new value', self.config.get('key'))
+
+    def test_reload_does_not_load_pending_variables(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str(validator=self.validator))
+
+        self.config.reload()
+
+        self.assertEqual([], self.validated)
+
+    def test_only_report_errors_of_loaded_variables(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+        self.config.declare('other_key', parse_str())
+
+        self.assertEqual('value', self.config.get('key'))
+        with self.assertRaises(AggregateConfigError):
+            self.config.get('other_key')
+
+    def test_validate_all(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+        self.config.declare('other_key', parse_str())
+        self.config.validate()
+
+        with self.assertRaises(AggregateConfigError) as context:
+            self.config.validate_all()
+
+        self.assertEqual(['OTHER_KEY'], [ex.variable_name for ex in context.exception.exceptions])
+
+    def test_raise_when_not_deferred(self):
+        config = Config(lazy=True, defer_raise=False)
+        config.declare('key', parse_str())
+
+        with self.assertRaises(ConfigValueError):
+            config.get('key')
+
+    def test_redeclare(self):
+        environ['KEY'] = '1'
+        self.config.declare('key', parse_str())
+        self.config.get('key')
+        self.config.declare('key', parse_int())
+
+        self.assertEqual(1, self.config.get('key'))
+
+    def test_values_load_all_variables(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+
+        self.assertEqual('value', self.config.values.key)
+
+
+class ListenerTest(ConfigTestCase):
+    def test_call_listeners_with_changes(self):
+        environ['KEY'] = 'value'
+        changes = []
+        self.config.declare('key', parse_str())
+        self.config.add_listener(changes.append)
+
+        self.config.reload()
+        environ['KEY'] = 'new value'
+        self.config.reload()
+
+        self.assertEqual([frozenset(['KEY'])], changes)
+
+    def test_remove_listener(self):
+        environ['KEY'] = 'value'
+        changes = []
+        self.config.declare('key', parse_str())
+        self.config.add_listener(changes.append)
+        self.config.remove_listener(changes.append)
+        environ['KEY'] = 'new value'
+
+        self.config.reload()
+
+        self.assertEqual([], changes)
+
+
+class ConfigViewTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = Config(defer_raise=True, namespace='namespace')
+        self.view = self.config.view('billing')
+
+    def test_declare_and_get_prefixed_variables(self):
+        environ['NAMESPACE_BILLING_KEY'] = 'value'
+
+        self.view.declare('key', parse_str())
+
+        self.assertIsInstance(self.view, ConfigView)
+        self.assertEqual('value', self.view.get('key'))
+        self.assertEqual('value', self.config.get('billing_key'))
+
+    def test_views_share_the_snapshot_of_the_config(self):
+        environ['NAMESPACE_BILLING_KEY'] = 'value'
+        environ['NAMESPACE_SHIPPING_KEY'] = 'other'
+
+        self.view.declare_many({'key': parse_str()})
+        self.config.view('shipping').declare('key', parse_str())
+
+        self.assertEqual({'namespace_billing_key': 'value', 'namespace_shipping_key': 'other'},
+                         self.config.snapshot.values)
+
+    def test_do_not_report_errors_of_other_namespaces(self):
+        environ['NAMESPACE_BILLING_KEY'] = 'value'
+        self.view.declare('key', parse_str())
+        self.config.view('shipping').declare('key', parse_str())
+
+        self.assertEqual('value', self.view.get('key'))
+        self.assertEqual(0, len(self.view.errors))
+        self.view.validate()
+        with self.assertRaises(AggregateConfigError):
+            self.config.get('billing_key')
+
+    def test_report_errors_of_the_namespace(self):
+        self.view.declare('key', parse_str())
+
+        with self.assertRaises(AggregateConfigError) as context:
+            self.view.validate()
+        self.assertEqual(['NAMESPACE_BILLING_KEY'], [ex.variable_name for ex in context.exception.exceptions])
+
+    def test_nested_views(self):
+        environ['NAMESPACE_BILLING_STRIPE_KEY'] = 'value'
+        view = self.view.view('stripe')
+
+        view.declare('key', parse_str())
+
+        self.assertEqual('billing_stripe', view.namespace)
+        self.assertEqual('value', self.view.get('stripe_key'))
+
+    def test_load_lazy_variables_on_get(self):
+        environ['NAMESPACE_BILLING_KEY'] = '1'
+        view = Config(namespace='namespace', lazy=True).view('billing')
+
+        view.declare('key', parse_int())
+
+        self.assertEqual(1, view.get('key'))
+
+
+class InterpolationTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = Config(defer_raise=True, interpolate=True)
+        environ['NAMESPACE_HOST'] = 'example.com'
+        environ['NAMESPACE_URL'] = 'http://${NAMESPACE_HOST}:${NAMESPACE_PORT}/'
+
+    def test_values_are_not_expanded_by_default(self):
+        config = Config()
+        config.declare('namespace_url', parse_str())
+
+        self.assertEqual('http://${NAMESPACE_HOST}:${NAMESPACE_PORT}/', config.get('namespace_url'))
+
+    def test_expand_references_to_undeclared_variables(self):
+        environ['NAMESPACE_PORT'] = '80'
+
+        self.config.declare('namespace_url', parse_str())
+
+        self.assertEqual('http://example.com:80/', self.config.get('namespace_url'))
+
+    def test_parse_expanded_values(self):
+        environ['NAMESPACE_PORT'] = '80'
+        environ['NAMESPACE_PORTS'] = '${NAMESPACE_PORT},443'
+
+        self.config.declare('namespace', {'port': parse_int(), 'ports': parse_int_list()})
+
+        self.assertEqual({'port': 80, 'ports': [80, 443]}, self.config.get('namespace'))
+
+    def test_report_undefined_references_as_parse_errors(self):
+        self.config.declare('namespace_url', parse_str())
+
+        with self.assertRaises(AggregateConfigError) as context:
+            self.config.get('namespace_url')
+        error, = [ex for ex in context.exception.exceptions if isinstance(ex, ConfigParseError)]
+        self.assertEqual('NAMESPACE_URL', error.key)
+        self.assertEqual('undefined variable ${NAMESPACE_PORT}', str(error.previous_error))
+
+    def test_ask_sources_for_undeclared_references(self):
+        environ['NAMESPACE_PORT'] = '80'
+        config = Config(defer_raise=True, interpolate=True, sources=[
+            EnvironSource(), DefaultsSource({'NAMESPACE_HOST': 'default.com', 'NAMESPACE_SCHEME': 'https'})
+        ])
+
+        config.declare_many({'namespace_url': parse_str()})
+        environ['NAMESPACE_URL'] = '${NAMESPACE_SCHEME}://${NAMESPACE_HOST}:${NAMESPACE_PORT}/'
+        config.reload()
+
+        self.assertEqual('https://example.com:80/', config.get('namespace_url'))
+        self.assertEqual('defaults', config.provenance['NAMESPACE_SCHEME'])
+
+    def test_custom_definitions_read_raw_file_contents(self):
+        environ['CONFIG_FILE'] = 'test/env'
+        config = Config(filename_variable='CONFIG_FILE', interpolate=True)
+
+        config.declare('namespace_url', lambda key, file_contents: (environ[key], file_contents.get('FIRST_VARIABLE')))
+
+        self.assertEqual(('http://${NAMESPACE_HOST}:${NAMESPACE_PORT}/', '123'), config.get('namespace_url'))
+        delete_environment_variable('CONFIG_FILE')
+
+    def test_reload_expands_values_whose_references_changed(self):
+        environ['NAMESPACE_PORT'] = '80'
+        self.config.declare_many({'namespace_url': parse_str(), 'namespace_host': parse_str()})
+        expansions = self.config.interpolator.expansions
+
+        environ['NAMESPACE_PORT'] = '8080'
+
+        self.assertEqual(frozenset(['NAMESPACE_URL']), self.config.reload())
+        self.assertEqual('http://example.com:8080/', self.config.get('namespace_url'))
+        self.assertEqual(expansions + 1, self.config.interpolator.expansions)
+
+
+class ParallelValidationTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        self.executor = ThreadPoolExecutor(max_workers=3)
+        for i in range(3):
+            environ['NAMESPACE_KEY{}'.format(i)] = str(i)
+
+    def tearDown(self):
+        super().tearDown()
+        self.executor.shutdown()
+
+    def test_validate_keys_concurrently(self):
+        # the barrier only opens if all three validators run at the same time
+        barrier = Barrier(3, timeout=5)
+        config = Config(namespace='namespace', validation_executor=self.executor)
+
+        config.declare_many({'key{}'.format(i): parse_int(validator=lambda value: barrier.wait()) for i in range(3)})
+        environ['NAMESPACE_KEY0'] = '10'
+        environ['NAMESPACE_KEY1'] = '11'
+        environ['NAMESPACE_KEY2'] = '12'
+        config.reload()
+
+        self.assertEqual([10, 11, 12], [config.get('key{}'.format(i)) for i in range(3)])
+
+    def test_aggregate_errors_like_sequential_loads(self):
+        environ['NAMESPACE_KEY1'] = 'one'
+        definitions = {'key{}'.format(i): parse_int() for i in range(3)}
+        definitions['missing'] = parse_int()
+        sequential = Config(namespace='namespace')
+        parallel = Config(namespace='namespace', validation_executor=self.executor)
+
+        sequential.declare_many(definitions)
+        parallel.declare_many(definitions)
+
+        self.assertEqual(str(AggregateConfigError(sequential.errors, None)),
+                         str(AggregateConfigError(parallel.errors, None)))
+        self.assertEqual(2, len(parallel.errors))
+
+    def test_raise_first_error_in_declaration_order(self):
+        environ['NAMESPACE_KEY1'] = 'one'
+        environ['NAMESPACE_KEY2'] = 'two'
+        config = Config(namespace='namespace', defer_raise=False, validation_executor=self.executor)
+
+        with self.assertRaises(ConfigParseError) as context:
+            config.declare_many({'key{}'.format(i): parse_int() for i in range(3)})
+
+        self.assertEqual('NAMESPACE_KEY1', context.exception.key)
+
+
+class ConcurrentReloadTest(ConfigTestCase):
+    reader_count = 8
+    duration = 0.5
+
+    def setUp(self):
+        super().setUp()
+        environ['KEY_A'] = '0'
+        environ['KEY_B'] = '0'
+        environ['KEY_FLAG'] = 'false'
+        self.config = Config(defer_raise=True)
+        self.config.declare('key', {'a': parse_int(), 'b': parse_int()})
+        self.config.declare('key_flag', parse_bool())
+
+    def tearDown(self):
+        super().tearDown()
+        for name in ('KEY_A', 'KEY_B', 'KEY_FLAG'):
+            delete_environment_variable(name)
+
+    def read_while_reloading(self):
+        stop = Event()
+        failures = []
+        reads = []
+
+        def read():
+            count = 0
+            try:
+                while not stop.is_set():
+                    value = self.config.get('key')
+                    if value['a'] != value['b']:
+                        failures.append(value)
+                    self.config.get('key_flag')
+                    count += 1
+            except BaseException as e:
+                failures.append(e)
+            reads.append(count)
+
+        def reload():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                environ['KEY_A'] = str(i)
+                environ['KEY_B'] = str(i)
+                environ['KEY_FLAG'] = 'true' if i % 2 else 'false'
+                self.config.reload()
+
+        threads = [Thread(target=read) for _ in range(self.reader_count)] + [Thread(target=reload)]
+        for thread in threads:
+            thread.start()
+        sleep(self.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], failures)
+        self.assertEqual(self.reader_count, len(reads))
+        for count in reads:
+            self.assertGreater(count, 100)
+
+    def test_readers_see_complete_snapshots(self):
+        self.read_while_reloading()
+
+    def test_frozen_readers_see_complete_snapshots(self):
+        self.config.freeze()
+        self.read_while_reloading()
+
+    def test_snapshots_are_not_changed_by_reload(self):
+        snapshot = self.config.snapshot
+        environ['KEY_A'] = '1'
+
+        self.config.reload()
+
+        self.assertEqual(0, snapshot.values['key']['a'])
+        self.assertEqual(1, self.config.snapshot.values['key']['a'])
+
+    def test_snapshots_are_not_changed_by_missing_keys(self):
+        snapshot = self.config.snapshot
+
+        with self.assertRaises(AggregateConfigError):
+            self.config.get('undeclared')
+
+        self.assertEqual(0, len(snapshot.errors))
+        self.assertEqual(1, len(self.config.snapshot.errors))
+
+
+class CompileTest(TestCase):
+    def test_compile_scalar(self):
+        definition = parse_int(5)
+        plan = _compile('key', definition, ('default',))
+
+        self.assertIsNone(plan.layout)
+        self.assertEqual(1, len(plan.entries))
+        self.assertEqual('KEY', plan.entries[0].env_key)
+        self.assertEqual(5, plan.entries[0].default)
+        self.assertIs(int, plan.entries[0].parser)
+
+    def test_compile_flattens_nested_definitions(self):
+        plan = _compile(
+            'key',
+            {
+                'string': parse_str(),
+                'dict2': {
+                    'int_list': parse_int_list(separator='-'),
+                    'dict3': {},
+                },
+            },
+            ('default',)
+        )
+
+        self.assertEqual(['KEY_STRING', 'KEY_DICT2_INT_LIST'], [entry.env_key for entry in plan.entries])
+        self.assertEqual([('string',), ('dict2', 'int_list')], [entry.path for entry in plan.entries])
+        self.assertEqual('-', plan.entries[1].separator)
+        self.assertEqual(frozenset(['default']), plan.entries[1].tags)
+
+    def test_load_plan_keeps_definition_order_and_empty_dicts(self):
+        environ['KEY_STRING'] = 'string'
+        environ['KEY_DICT2_INT'] = '1'
+        plan = _compile('key', {'dict2': {'int': parse_int(), 'dict3': {}}, 'string': parse_str()}, ('default',))
+
+        result = _load_plan(plan, 'default', True, {})
+
+        self.assertEqual([], result.exceptions)
+        self.assertEqual(['dict2', 'string'], list(result.value.keys()))
+        self.assertEqual({'int': 1, 'dict3': {}}, result.value['dict2'])
+        delete_environment_variable('KEY_STRING')
+        delete_environment_variable('KEY_DICT2_INT')
+
+    def test_load_plan_returns_misses_without_raising(self):
+        plan = _compile('key', {'optional': parse_int(default=5), 'required': parse_int()}, ('default',))
+
+        result = _load_plan(plan, 'default', True, {}, {})
+
+        self.assertEqual({'optional': 5}, result.value)
+        error, = result.exceptions
+        self.assertIsInstance(error, ConfigValueError)
+        # an exception that was never raised has no traceback
+        self.assertIsNone(error.__traceback__)
+
+    def test_load_plan_does_not_read_inactive_keys(self):
+        plan = _compile('key', parse_int(), ('other',))
+
+        result = _load_plan(plan, 'default', False, {'KEY': 'invalid'}, {'KEY': 'invalid'})
+
+        self.assertIs(_INACTIVE, result.value)
+        self.assertEqual([], result.exceptions)
+        self.assertEqual((), result.outcomes)
+
+
+class FreezeTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config = Config(defer_raise=True)
+
+    def test_get_frozen_value(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+        self.config.declare('dict', {'value': parse_int(1)})
+        self.config.freeze()
+
+        self.assertEqual('value', self.config.get('key'))
+        self.assertEqual({'value': 1}, self.config.get('dict'))
+
+    def test_freeze_raises_all_errors(self):
+        self.config.declare('key', parse_str())
+        self.config.declare('other_key', parse_str())
+        with self.assertRaises(AggregateConfigError) as context:
+            self.config.freeze()
+
+        self.assertEqual(2, len(context.exception.exceptions))
+
+    def test_validate(self):
+        self.config.declare('key', parse_str('default'))
+        self.config.validate()
+
+        self.config.declare('other_key', parse_str())
+        with self.assertRaises(AggregateConfigError):
+            self.config.validate()
+
+    def test_reload_updates_frozen_values(self):
+        environ['KEY'] = 'original value'
+        self.config.declare('key', parse_str())
+        self.config.freeze()
+        environ['KEY'] = 'new value'
+
+        self.config.reload()
+
+        self.assertEqual('new value', self.config.get('key'))
+
+    def test_reload_with_errors_raises_on_get(self):
+        environ['KEY'] = 'value'
+        self.config.declare('key', parse_str())
+        self.config.freeze()
+        del environ['KEY']
+
+        self.config.reload()
+
+        with self.assertRaises(AggregateConfigError):
+            self.config.get('key')
+
+    def test_missing_key_raises_on_later_gets_frozen_or_not(self):
+        environ['KEY'] = 'value'
+        for frozen in (False, True):
+            with self.subTest(frozen=frozen):
+                config = Config(defer_raise=True)
+                config.declare('key', parse_str())
+                if frozen:
+                    config.freeze()
+
+                with self.assertRaises(AggregateConfigError):
+                    config.get('undeclared')
+                with self.assertRaises(AggregateConfigError):
+                    config.get('key')
+
+    def test_frozen_get_raises_for_variables_from_another_tag(self):
+        self.config.declare('optional', parse_str(), ('default',), 'other')
+        self.config.freeze()
+
+        with self.assertRaises(ConfigNotInCurrentTagError):
+            self.config.get('optional')
+
+    def test_frozen_get_with_namespace(self):
+        environ['NAMESPACE_KEY'] = 'value'
+        config = Config(namespace='namespace')
+        config.declare('key', parse_str())
+        config.freeze()
+
+        self.assertEqual('value', config.get('key'))
+
+
 class ErrorReportingTest(ConfigTestCase, snapshottest.TestCase):
     def setUp(self):
         super().setUp()
@@ -700,6 +1439,51 @@ class ErrorReportingTest(ConfigTestCase, snapshottest.TestCase):
         self.assertMatchSnapshot(str(context.exception))
 
 
+    def test_getting_an_undeclared_key_repeatedly_records_one_error(self):
+        for _ in range(10):
+            with self.assertRaises(AggregateConfigError):
+                self.config.get('undeclared')
+
+        self.assertEqual(1, len(self.config.errors))
+
+    def test_reload_replaces_errors(self):
+        self.config.declare('err_key_1', parse_int())
+        self.config.declare('err_key_2', parse_int())
+        environ['ERR_KEY_1'] = '1'
+
+        self.config.reload()
+
+        self.assertEqual(['ERR_KEY_2'], [ex.variable_name for ex in self.config.errors])
+
+
+class ErrorRegistryTest(TestCase):
+    def test_deduplicate_errors(self):
+        registry = ErrorRegistry()
+        registry.add('key', ConfigValueError('KEY'))
+        registry.add('key', ConfigValueError('KEY'))
+        registry.add('key', ConfigParseError('KEY', ValueError()))
+
+        self.assertEqual(2, len(registry))
+
+    def test_replace_errors_of_a_group(self):
+        registry = ErrorRegistry()
+        registry.add('key', ConfigValueError('KEY_1'))
+        registry.add('other', ConfigValueError('OTHER'))
+
+        registry.replace('key', [ConfigValueError('KEY_2')])
+
+        self.assertEqual(['OTHER', 'KEY_2'], [ex.variable_name for ex in registry])
+
+    def test_discard_group(self):
+        registry = ErrorRegistry()
+        registry.add('key', ConfigValueError('KEY'))
+
+        registry.discard('key')
+        registry.discard('unknown')
+
+        self.assertEqual(0, len(registry))
+
+
 class ConfigTagsTest(ConfigTestCase):
 
     def test_do_not_raise_when_declaring_a_variable_in_another_environment(self):
@@ -726,6 +1510,56 @@ class ConfigTagsTest(ConfigTestCase):
         with self.assertRaises(ConfigNotInCurrentTagError):
             self.config.get('optional')
 
+    def test_do_not_parse_variables_from_another_environment(self):
+        environ['KEY'] = 'invalid'
+        parsed = []
+        self.config.declare('key', parse_int(validator=parsed.append), ('default',), 'other')
+
+        self.assertEqual([], parsed)
+        self.assertEqual(0, len(self.config.errors))
+        with self.assertRaises(ConfigNotInCurrentTagError):
+            self.config.get('key')
+
+    def test_switch_tag_loads_variables_that_become_active(self):
+        environ['KEY'] = '1'
+        changes = []
+        self.config.declare('key', parse_int(), ('live',), 'test')
+        self.config.add_listener(changes.append)
+
+        self.assertEqual(frozenset(['KEY']), self.config.switch_tag('live'))
+        self.assertEqual(1, self.config.get('key'))
+        self.assertEqual([frozenset(['KEY'])], changes)
+
+    def test_switch_tag_drops_variables_that_become_inactive(self):
+        environ['KEY'] = '1'
+        self.config.declare('key', parse_int(), ('live',), 'live')
+
+        self.config.switch_tag('test')
+
+        with self.assertRaises(ConfigNotInCurrentTagError) as context:
+            self.config.get('key')
+        self.assertEqual('test', context.exception.tag)
+
+    def test_switch_tag_does_not_parse_variables_that_stay_active_or_inactive(self):
+        environ['KEY'] = '1'
+        parsed = []
+        self.config.declare('key', parse_int(validator=parsed.append), ('live', 'test'), 'live')
+        self.config.declare('other', parse_int(validator=parsed.append), ('worker',), 'live')
+        parsed.clear()
+
+        self.assertEqual(frozenset(), self.config.switch_tag('test'))
+        self.assertEqual([], parsed)
+        self.assertEqual(1, self.config.get('key'))
+
+    def test_switch_tag_of_lazy_config(self):
+        environ['KEY'] = '1'
+        config = Config(lazy=True)
+        config.declare('key', parse_int(), ('live',), 'test')
+
+        config.switch_tag('live')
+
+        self.assertEqual(1, config.get('key'))
+
 
 class LoadConfigFromFileTest(ConfigTestCase, snapshottest.TestCase):
     def test_load_bash_file(self):
@@ -765,6 +1599,294 @@ class LoadConfigFromFileTest(ConfigTestCase, snapshottest.TestCase):
         self.config.declare('variable1', parse_int(), ('test',), 'test')
 
 
+class StatsTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        with open(self.filename, 'w') as f:
+            f.write('export FILE_VARIABLE=1\n')
+        environ['CONFIG_FILE'] = self.filename
+        environ['KEY'] = 'value'
+        self.events = []
+        self.config = Config(filename_variable='CONFIG_FILE', file_cache=FileCache())
+        self.config.enable_stats(lambda event, data: self.events.append((event, data)))
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.filename)
+        delete_environment_variable('CONFIG_FILE')
+        delete_environment_variable('FILE_VARIABLE')
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Config().stats())
+
+    def test_record_parses_and_lookups(self):
+        self.config.declare('key', parse_str())
+        self.config.declare('file_variable', parse_int())
+
+        stats = self.config.stats()
+        self.assertEqual({'KEY', 'FILE_VARIABLE'}, set(stats['keys'].keys()))
+        self.assertEqual(1, stats['keys']['KEY']['parses'])
+        self.assertGreaterEqual(stats['keys']['KEY']['parse_time'], 0.0)
+        self.assertGreaterEqual(stats['keys']['KEY']['validate_time'], 0.0)
+        self.assertEqual(2, stats['environ_lookups'])
+        self.assertEqual(1, stats['file_lookups'])
+        self.assertEqual(2, stats['file_reads'])
+        self.assertEqual(1, stats['file_cache_misses'])
+        self.assertEqual(1, stats['file_cache_hits'])
+        self.assertEqual(['file_read', 'file_read', 'parse', 'parse'], sorted(event for event, _ in self.events))
+
+    def test_count_file_cache_hits_per_config(self):
+        file_cache = FileCache()
+        other = Config(filename_variable='CONFIG_FILE', file_cache=file_cache)
+        other.declare('file_variable', parse_int())
+        config = Config(filename_variable='CONFIG_FILE', file_cache=file_cache)
+        config.enable_stats()
+
+        config.declare('file_variable', parse_int())
+
+        stats = config.stats()
+        self.assertEqual(1, stats['file_cache_hits'])
+        self.assertEqual(0, stats['file_cache_misses'])
+
+    def test_do_not_count_file_lookups_without_config_file(self):
+        config = Config()
+        config.enable_stats()
+
+        config.declare('file_variable', parse_int(default=1))
+
+        self.assertEqual(1, config.stats()['environ_lookups'])
+        self.assertEqual(0, config.stats()['file_lookups'])
+
+    def test_record_gets(self):
+        self.config.declare('key', parse_str())
+
+        self.config.get('key')
+        self.config.get('key')
+
+        self.assertEqual({'key': 2}, self.config.stats()['gets'])
+
+    def test_record_reloads(self):
+        self.config.declare('key', parse_str())
+        environ['KEY'] = 'new value'
+
+        self.config.reload()
+        self.config.reload()
+
+        stats = self.config.stats()
+        self.assertEqual(2, stats['reloads'])
+        self.assertEqual(2, stats['keys']['KEY']['parses'])
+        self.assertGreaterEqual(stats['reload_time'], stats['last_reload_time'])
+        reloads = [data for event, data in self.events if event == 'reload']
+        self.assertEqual([frozenset({'KEY'}), frozenset()], [data['changes'] for data in reloads])
+
+    def test_record_custom_definitions(self):
+        self.config.declare('key', lambda key, file_contents: 'custom')
+
+        self.assertEqual(1, self.config.stats()['keys']['KEY']['parses'])
+
+    def test_disable(self):
+        self.config.declare('key', parse_str())
+        self.config.disable_stats()
+
+        self.assertEqual('value', self.config.get('key'))
+        self.assertIsNone(self.config.stats())
+
+
+class ValidatorCacheTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        self.validated = []
+        self.validator_cache = ValidatorCache()
+        self.config = Config(validator_cache=self.validator_cache)
+
+    def validator(self, value):
+        self.validated.append(value)
+        if value < 0:
+            raise ValueError('negative')
+
+    def test_validate_repeated_list_elements_once(self):
+        environ['KEY'] = '1,2,1,1,2'
+        self.config.declare('key', parse_int_list(validator=self.validator))
+
+        self.assertEqual([1, 2, 1, 1, 2], self.config.get('key'))
+        self.assertEqual([1, 2], self.validated)
+
+    def test_keep_validated_values_across_declarations_and_reloads(self):
+        environ['KEY'] = '1'
+        self.config.declare('key', parse_int(validator=self.validator))
+        environ['KEY'] = '2'
+        self.config.reload()
+        environ['KEY'] = '1'
+        self.config.reload()
+        self.config.declare('key', parse_int(validator=self.validator))
+
+        self.assertEqual([1, 2], self.validated)
+        self.assertEqual(2, self.validator_cache.hits)
+
+    def test_opt_out(self):
+        environ['KEY'] = '1,1'
+        self.config.declare('key', parse_int_list(validator=self.validator, memoize=False))
+
+        self.assertEqual([1, 1], self.validated)
+
+    def test_validate_invalid_values_again(self):
+        environ['KEY'] = '-1,-1'
+        self.config.declare('key', parse_int_list(validator=self.validator))
+
+        self.assertEqual([-1], self.validated)
+        self.config.declare('key', parse_int_list(validator=self.validator))
+        self.assertEqual([-1, -1], self.validated)
+
+    def test_distinguish_types(self):
+        self.validator_cache.validate(self.validator, 1)
+        self.validator_cache.validate(self.validator, 1.0)
+        self.validator_cache.validate(self.validator, True)
+
+        self.assertEqual(3, len(self.validated))
+
+    def test_evict_least_recently_used(self):
+        validator_cache = ValidatorCache(maxsize=2)
+        validator_cache.validate(self.validator, 1)
+        validator_cache.validate(self.validator, 2)
+        validator_cache.validate(self.validator, 1)
+        validator_cache.validate(self.validator, 3)
+        validator_cache.validate(self.validator, 1)
+        validator_cache.validate(self.validator, 2)
+
+        self.assertEqual([1, 2, 3, 2], self.validated)
+        self.assertEqual(2, len(validator_cache))
+
+    def test_unhashable_values(self):
+        self.validator_cache.validate(len, [1])
+        self.validator_cache.validate(len, [1])
+
+        self.assertEqual(0, len(self.validator_cache))
+
+
+class FileCacheTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        self.write_file('export FIRST_VARIABLE=1\nexport SECOND_VARIABLE=2\n')
+        environ['CONFIG_FILE'] = self.filename
+        self.file_cache = FileCache()
+        self.config = Config(filename_variable='CONFIG_FILE', file_cache=self.file_cache)
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.filename)
+        delete_environment_variable('CONFIG_FILE')
+
+    def write_file(self, contents):
+        with open(self.filename, 'w') as f:
+            f.write(contents)
+
+    def test_read_file_once_for_multiple_declarations(self):
+        self.config.declare('first_variable', parse_int())
+        self.config.declare('second_variable', parse_int())
+
+        self.assertEqual(1, self.file_cache.misses)
+        self.assertEqual(1, self.file_cache.hits)
+        self.assertEqual(2, self.config.get('second_variable'))
+
+    def test_read_file_again_when_it_changes(self):
+        self.config.declare('first_variable', parse_int())
+        self.write_file('export FIRST_VARIABLE=1234\n')
+
+        self.config.reload()
+
+        self.assertEqual(2, self.file_cache.misses)
+        self.assertEqual(1234, self.config.get('first_variable'))
+
+    def test_clear(self):
+        self.config.declare('first_variable', parse_int())
+        self.file_cache.clear()
+        self.config.declare('second_variable', parse_int())
+
+        self.assertEqual(1, self.file_cache.misses)
+        self.assertEqual(0, self.file_cache.hits)
+
+
+class DeclareManyTest(ConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        delete_environment_variable('KEY_INT')
+        delete_environment_variable('KEY_DICT_STRING')
+        delete_environment_variable('OTHER_KEY')
+
+    def test_declare_many(self):
+        environ['KEY_INT'] = '1'
+        environ['KEY_DICT_STRING'] = 'string'
+        self.config.declare_many({
+            'key_int': parse_int(),
+            'key_dict': {'string': parse_str()},
+        })
+
+        self.assertEqual(1, self.config.get('key_int'))
+        self.assertEqual({'string': 'string'}, self.config.get('key_dict'))
+
+    def test_declare_many_reads_file_once(self):
+        environ['CONFIG_FILE'] = 'test/env'
+        file_cache = FileCache()
+        config = Config(filename_variable='CONFIG_FILE', file_cache=file_cache)
+        config.declare_many(
+            {
+                'first_variable': parse_int(),
+                'second_variable': parse_int(),
+                'dict1': {'value1': parse_int()},
+            },
+            ('test',),
+            'test'
+        )
+
+        self.assertEqual(1, file_cache.misses)
+        self.assertEqual(0, file_cache.hits)
+        self.assertEqual({'value1': 123}, config.get('dict1'))
+        delete_environment_variable('CONFIG_FILE')
+
+    def test_declare_many_aggregates_errors(self):
+        config = Config(defer_raise=True)
+        config.declare_many({
+            'key_int': parse_int(),
+            'other_key': parse_str(),
+        })
+
+        with self.assertRaises(AggregateConfigError) as context:
+            config.get('key_int')
+
+        variable_names = [ex.variable_name for ex in context.exception.exceptions if isinstance(ex, ConfigValueError)]
+        self.assertEqual(['KEY_INT', 'OTHER_KEY'], variable_names)
+
+    def test_redeclare_replaces_errors_of_the_earlier_definition(self):
+        environ['KEY'] = 'abc'
+        config = Config(defer_raise=True)
+        config.declare('key', parse_int())
+
+        config.declare('key', parse_str())
+
+        self.assertEqual('abc', config.get('key'))
+
+    def test_lazy_redeclare_replaces_errors_of_the_earlier_definition(self):
+        environ['KEY'] = 'abc'
+        config = Config(defer_raise=True, lazy=True)
+        config.declare('key', parse_int())
+        with self.assertRaises(AggregateConfigError):
+            config.get('key')
+
+        config.declare('key', parse_str())
+
+        self.assertEqual('abc', config.get('key'))
+
+    def test_from_schema(self):
+        environ['NAMESPACE_KEY_INT'] = '1'
+        config = Config.from_schema({'key_int': parse_int()}, namespace='namespace', defer_raise=False)
+
+        self.assertEqual(1, config.get('key_int'))
+
+
 class NamespaceTest(ConfigTestCase, snapshottest.TestCase):
 
     def test_load_prefixed_environment_variable(self):
@@ -835,3 +1957,85 @@ class LoggerConfigTest(ConfigTestCase, snapshottest.TestCase):
         with self.assertRaises(ConfigError) as context:
             self.config.apply_log_levels()
         self.assertMatchSnapshot(str(context.exception))
+
+    def test_only_apply_changed_log_levels(self):
+        logger = logging.getLogger('env_config_test.unchanged')
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.UNCHANGED'] = 'info'
+        self.config.apply_log_levels()
+        logger.setLevel(logging.ERROR)
+
+        self.config.apply_log_levels()
+        self.assertEqual(logging.ERROR, logger.level)
+
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.UNCHANGED'] = 'debug'
+        self.config.reload()
+        self.assertEqual(logging.DEBUG, logger.level)
+
+    def test_reload_applies_added_and_forgets_removed_log_levels(self):
+        logger = logging.getLogger('env_config_test.added')
+        self.config = Config()
+        self.config.apply_log_levels()
+        self.config.reload()
+
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.ADDED'] = 'error'
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.NOT_CREATED'] = 'error'
+        self.config.reload()
+        self.assertEqual(logging.ERROR, logger.level)
+        self.assertEqual(1, len(self.config.errors))
+
+        del environ['LOG_LEVEL_ENV_CONFIG_TEST.NOT_CREATED']
+        self.config.reload()
+        self.assertEqual(0, len(self.config.errors))
+
+    def test_configure_new_loggers(self):
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.LATE'] = 'warning'
+        self.config.apply_log_levels(configure_new_loggers=True)
+        self.assertEqual(0, len(self.config.errors))
+
+        logger = logging.getLogger('env_config_test.late')
+
+        self.assertEqual(logging.WARNING, logger.level)
+
+    def test_restore_get_logger_once_new_loggers_are_configured(self):
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.HOOKED'] = 'warning'
+        self.config.apply_log_levels(configure_new_loggers=True)
+        self.assertIn('getLogger', vars(logging.Logger.manager))
+
+        logging.getLogger('env_config_test.hooked')
+        self.assertNotIn('getLogger', vars(logging.Logger.manager))
+
+    def test_restore_get_logger_when_expected_levels_are_removed(self):
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.NEVER_CREATED'] = 'warning'
+        self.config.apply_log_levels(configure_new_loggers=True)
+        self.assertIn('getLogger', vars(logging.Logger.manager))
+
+        del environ['LOG_LEVEL_ENV_CONFIG_TEST.NEVER_CREATED']
+        self.config.reload()
+        self.assertNotIn('getLogger', vars(logging.Logger.manager))
+
+    def test_apply_to_logger_created_after_error(self):
+        self.config = Config()
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.CREATED_LATER'] = 'warning'
+        self.config.apply_log_levels()
+        self.assertEqual(1, len(self.config.errors))
+
+        logger = logging.getLogger('env_config_test.created_later')
+        self.config.apply_log_levels()
+
+        self.assertEqual(0, len(self.config.errors))
+        self.assertEqual(logging.WARNING, logger.level)
+
+    def test_placeholder_is_not_a_logger(self):
+        logging.getLogger('env_config_test.placeholder.child')
+        environ['LOG_LEVEL_ENV_CONFIG_TEST.PLACEHOLDER'] = 'warning'
+
+        with self.assertRaises(ConfigError):
+            self.config.apply_log_levels()
+
+    def test_keep_reporting_invalid_log_levels(self):
+        self.config = Config()
+        environ['LOG_LEVEL'] = 'loud'
+        self.config.apply_log_levels()
+        self.config.apply_log_levels()
+
+        self.assertEqual(1, len(self.config.errors))
@@ -0,0 +1,110 @@
+from collections.abc import Mapping
+
+_EXPORT = b'export'
+_BLANK = b' \t'
+_SPECIAL = frozenset('\'"\\ \t')
+
+
+def _unquote(raw):
+    """
+    decode a value the way bash would expand it in an export statement
+    :param raw: str the text after the '=' of an export line
+    :return: str
+    """
+    if not _SPECIAL.intersection(raw):
+        return raw
+    result = []
+    i = 0
+    length = len(raw)
+    while i < length:
+        char = raw[i]
+        if char in ' \t':
+            # unquoted whitespace ends the value, the rest of the line are further arguments or a comment
+            break
+        if char == "'":
+            end = raw.find("'", i + 1)
+            if end == -1:
+                end = length
+            result.append(raw[i + 1:end])
+            i = end + 1
+        elif char == '"':
+            i += 1
+            while i < length and raw[i] != '"':
+                if raw[i] == '\\' and i + 1 < length and raw[i + 1] in '"\\$`':
+                    i += 1
+                result.append(raw[i])
+                i += 1
+            i += 1
+        elif char == '\\':
+            if i + 1 < length:
+                result.append(raw[i + 1])
+            i += 2
+        else:
+            result.append(char)
+            i += 1
+    return ''.join(result)
+
+
+class EnvFile(Mapping):
+
+    def __init__(self, index, filename=None):
+        """
+        Read-only mapping of the variables exported by a bash file.
+
+        Holds the raw value of every export and decodes a value only when it is accessed.
+        Use EnvFile.read() to scan a file.
+
+        :param index: dict raw values by variable name
+        :param filename: str
+        """
+        super().__init__()
+        self.__index = index
+        self.__values = {}
+        self.__filename = filename
+
+    @classmethod
+    def read(cls, filename):
+        """
+        scan a bash file line by line and index its export statements
+        :param filename: str
+        :return: EnvFile
+        """
+        index = {}
+        with open(filename, 'rb') as f:
+            for line in f:
+                line = line.lstrip(_BLANK)
+                if not line.startswith(_EXPORT) or line[6:7] not in _BLANK:
+                    continue
+                key, divider, raw = line[7:].lstrip(_BLANK).partition(b'=')
+                if not divider or not key or key.strip(_BLANK) != key:
+                    continue
+                index[key.decode('utf-8')] = raw.rstrip(b'\r\n')
+        return cls(index, filename)
+
+    @property
+    def filename(self):
+        return self.__filename
+
+    def __getitem__(self, key):
+        try:
+            return self.__values[key]
+        except KeyError:
+            value = self.__values[key] = _unquote(self.__index[key].decode('utf-8'))
+            return value
+
+    def get(self, key, default=None):
+        if key not in self.__index:
+            return default
+        return self[key]
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def __iter__(self):
+        return iter(self.__index)
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __repr__(self):
+        return 'EnvFile({!r}, {} variables)'.format(self.__filename, len(self.__index))
@@ -0,0 +1,69 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ddt import ddt, data, unpack
+
+from env_config import EnvFile
+
+
+@ddt
+class EnvFileTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.filename)
+
+    def read(self, contents):
+        with open(self.filename, 'w') as f:
+            f.write(contents)
+        return EnvFile.read(self.filename)
+
+    @data(
+        ('export KEY=value\n', 'value'),
+        ('export KEY=value', 'value'),
+        ('export KEY=value\r\n', 'value'),
+        ('  export\tKEY=value\n', 'value'),
+        ('export KEY=a=b=c\n', 'a=b=c'),
+        ('export KEY=\n', ''),
+        ('export KEY="quoted value"\n', 'quoted value'),
+        ("export KEY='single quoted'\n", 'single quoted'),
+        ('export KEY="a \\"b\\" \\\\ \\$c \\n"\n', 'a "b" \\ $c \\n'),
+        ("export KEY='no \\escapes'\n", 'no \\escapes'),
+        ('export KEY=escaped\\ space\n', 'escaped space'),
+        ('export KEY=prefix"quoted part"\'and more\'\n', 'prefixquoted partand more'),
+        ('export KEY=value # comment\n', 'value'),
+        ('export KEY=#value\n', '#value'),
+        ('export KEY="unterminated\n', 'unterminated'),
+        ('export KEY=ünïcödé\n', 'ünïcödé'),
+    )
+    @unpack
+    def test_decode_value(self, contents, expected):
+        self.assertEqual(expected, self.read(contents)['KEY'])
+
+    @data(
+        'KEY=value\n',
+        '# export KEY=value\n',
+        'exportKEY=value\n',
+        'export KEY\n',
+        'export KEY =value\n',
+        'export =value\n',
+    )
+    def test_ignore_lines_without_export(self, contents):
+        self.assertNotIn('KEY', self.read(contents))
+
+    def test_mapping(self):
+        env_file = self.read('#!/usr/bin/env bash\n\nexport FIRST=1\nSKIPPED=2\nexport SECOND=2\nexport FIRST=3\n')
+
+        self.assertEqual(2, len(env_file))
+        self.assertEqual(['FIRST', 'SECOND'], list(env_file))
+        self.assertEqual({'FIRST': '3', 'SECOND': '2'}, dict(env_file))
+        self.assertIsNone(env_file.get('MISSING'))
+        self.assertEqual(self.filename, env_file.filename)
+
+    def test_empty(self):
+        self.assertEqual(0, len(self.read('# nothing exported\n')))
@@ -0,0 +1,200 @@
+import re
+from threading import Lock
+
+_REFERENCE = re.compile(r'\$(\$?)\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def _scan(raw):
+    """
+    split a raw value at its references
+    :param raw: str
+    :return: tuple(tuple(str), tuple(str)) the literal parts and the names referenced between them
+    """
+    if '${' not in raw:
+        return (raw,), ()
+    literals = []
+    names = []
+    literal = ''
+    start = 0
+    for match in _REFERENCE.finditer(raw):
+        literal += raw[start:match.start()]
+        if match.group(1):
+            # $${NAME} is the literal text ${NAME}
+            literal += match.group(0)[1:]
+        else:
+            literals.append(literal)
+            names.append(match.group(2))
+            literal = ''
+        start = match.end()
+    literals.append(literal + raw[start:])
+    return tuple(literals), tuple(names)
+
+
+class Interpolator(object):
+
+    def __init__(self):
+        """
+        Expands ${NAME} references in raw values. $${NAME} is the literal text ${NAME}.
+
+        The references of every value are scanned once and kept in a dependency graph between loads.
+        Values are expanded in dependency order and memoized. A value is only expanded again if its raw value
+        or the raw value of a variable it references changed.
+        """
+        super().__init__()
+        self.__lock = Lock()
+        self.__raws = {}
+        self.__templates = {}
+        self.__dependents = {}
+        self.__resolved = {}
+        self.__expansions = 0
+
+    @property
+    def expansions(self):
+        """
+        :return: int how many values were expanded since the interpolator was created
+        """
+        return self.__expansions
+
+    def resolve(self, names, lookup):
+        """
+        :param names: list(str) the variables to resolve
+        :param lookup: callable returns the raw value of a variable or None if it is not set
+        :return: tuple(dict, dict) the expanded values and the errors of variables that could not be expanded,
+                 by name. Variables that are not set are in neither.
+        """
+        with self.__lock:
+            self.__invalidate(self.__refresh(names, lookup))
+            self.__evaluate(names)
+            values = {}
+            errors = {}
+            for name in names:
+                if self.__raws[name] is None:
+                    continue
+                value = self.__resolved[name]
+                if isinstance(value, ValueError):
+                    errors[name] = value
+                else:
+                    values[name] = value
+            return values, errors
+
+    def __refresh(self, names, lookup):
+        """
+        look up every variable the names depend on and scan the values that changed since the last load
+        :return: set(str) the variables whose raw value changed
+        """
+        changed = set()
+        seen = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            raw = lookup(name)
+            if name not in self.__raws or self.__raws[name] != raw:
+                self.__update(name, raw)
+                changed.add(name)
+            template = self.__templates.get(name)
+            if template is not None:
+                stack.extend(template[1])
+        return changed
+
+    def __update(self, name, raw):
+        template = self.__templates.pop(name, None)
+        if template is not None:
+            for reference in template[1]:
+                self.__dependents[reference].discard(name)
+        self.__raws[name] = raw
+        if raw is not None:
+            template = self.__templates[name] = _scan(raw)
+            for reference in template[1]:
+                self.__dependents.setdefault(reference, set()).add(name)
+
+    def __invalidate(self, changed):
+        """
+        forget the expanded values of the changed variables and of everything that depends on them
+        """
+        seen = set()
+        stack = list(changed)
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            self.__resolved.pop(name, None)
+            stack.extend(self.__dependents.get(name, ()))
+
+    def __evaluate(self, names):
+        """
+        expand all variables the names depend on that are not memoized, in topological order
+        """
+        resolved = self.__resolved
+        pending = set()
+        stack = [name for name in names if name not in resolved]
+        while stack:
+            name = stack.pop()
+            if name in pending or name in resolved:
+                continue
+            if self.__raws[name] is None:
+                resolved[name] = ValueError('undefined variable ${{{}}}'.format(name))
+                continue
+            pending.add(name)
+            stack.extend(self.__templates[name][1])
+        if len(pending) == 0:
+            return
+
+        # Kahn's algorithm, a variable is ready once all variables it references are resolved
+        waiting = {}
+        ready = []
+        for name in pending:
+            count = sum(1 for reference in set(self.__templates[name][1]) if reference in pending)
+            if count == 0:
+                ready.append(name)
+            else:
+                waiting[name] = count
+        while ready:
+            name = ready.pop()
+            resolved[name] = self.__expand(name)
+            for dependent in self.__dependents.get(name, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        del waiting[dependent]
+                        ready.append(dependent)
+
+        if len(waiting) > 0:
+            # whatever is left is part of a cycle or depends on one
+            reachable = {name: self.__reachable(name, waiting) for name in waiting}
+            for name in waiting:
+                cycle = sorted(member for member in reachable[name] if member in reachable[member])
+                resolved[name] = ValueError('circular reference between {}'.format(
+                    ', '.join('${{{}}}'.format(member) for member in cycle)
+                ))
+
+    def __reachable(self, name, names):
+        """
+        :return: set(str) the variables of names that name references directly or indirectly
+        """
+        reachable = set()
+        stack = list(self.__templates[name][1])
+        while stack:
+            reference = stack.pop()
+            if reference in reachable or reference not in names:
+                continue
+            reachable.add(reference)
+            stack.extend(self.__templates[reference][1])
+        return reachable
+
+    def __expand(self, name):
+        literals, references = self.__templates[name]
+        if len(references) == 0:
+            return literals[0]
+        self.__expansions += 1
+        parts = [literals[0]]
+        for reference, literal in zip(references, literals[1:]):
+            value = self.__resolved[reference]
+            if isinstance(value, ValueError):
+                return value
+            parts.append(value)
+            parts.append(literal)
+        return ''.join(parts)
@@ -0,0 +1,90 @@
+from unittest import TestCase
+
+from env_config import Interpolator
+from env_config.interpolation import _scan
+
+
+class ScanTest(TestCase):
+    def test_value_without_references(self):
+        self.assertEqual((('plain $value',), ()), _scan('plain $value'))
+
+    def test_split_at_references(self):
+        self.assertEqual((('http://', ':', '/'), ('HOST', 'PORT')), _scan('http://${HOST}:${PORT}/'))
+
+    def test_escaped_references_are_literals(self):
+        self.assertEqual((('${HOST}:', ''), ('PORT',)), _scan('$${HOST}:${PORT}'))
+
+
+class InterpolatorTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.interpolator = Interpolator()
+        self.raws = {}
+
+    def resolve(self, *names):
+        return self.interpolator.resolve(list(names), self.raws.get)
+
+    def test_resolve_chains_of_references(self):
+        self.raws.update({'URL': 'http://${HOST}/', 'HOST': '${NAME}:80', 'NAME': 'example.com'})
+
+        self.assertEqual(({'URL': 'http://example.com:80/'}, {}), self.resolve('URL'))
+
+    def test_skip_variables_that_are_not_set(self):
+        self.assertEqual(({}, {}), self.resolve('MISSING'))
+
+    def test_memoize_resolved_values(self):
+        self.raws.update({'FIRST': '${VALUE}', 'SECOND': '${VALUE}', 'VALUE': 'value'})
+        self.resolve('FIRST', 'SECOND')
+
+        self.assertEqual(({'FIRST': 'value', 'SECOND': 'value'}, {}), self.resolve('FIRST', 'SECOND'))
+        self.assertEqual(2, self.interpolator.expansions)
+
+    def test_only_expand_dependents_of_changed_values(self):
+        self.raws.update({'FIRST': '${ONE}', 'SECOND': '${TWO}', 'ONE': '1', 'TWO': '2'})
+        self.resolve('FIRST', 'SECOND')
+
+        self.raws['TWO'] = 'two'
+
+        self.assertEqual(({'FIRST': '1', 'SECOND': 'two'}, {}), self.resolve('FIRST', 'SECOND'))
+        self.assertEqual(3, self.interpolator.expansions)
+
+    def test_expand_again_when_a_reference_is_replaced(self):
+        self.raws.update({'URL': '${OLD}', 'OLD': 'old', 'NEW': 'new'})
+        self.resolve('URL')
+
+        self.raws['URL'] = '${NEW}'
+        self.raws['OLD'] = 'changed'
+
+        self.assertEqual(({'URL': 'new'}, {}), self.resolve('URL'))
+
+    def test_report_undefined_references(self):
+        self.raws.update({'URL': 'http://${HOST}/'})
+
+        values, errors = self.resolve('URL')
+
+        self.assertEqual({}, values)
+        self.assertEqual('undefined variable ${HOST}', str(errors['URL']))
+
+    def test_resolve_once_an_undefined_reference_is_set(self):
+        self.raws.update({'URL': 'http://${HOST}/'})
+        self.resolve('URL')
+
+        self.raws['HOST'] = 'example.com'
+
+        self.assertEqual(({'URL': 'http://example.com/'}, {}), self.resolve('URL'))
+
+    def test_report_cycles(self):
+        self.raws.update({'FIRST': '${SECOND}', 'SECOND': '${FIRST}', 'SELF': 'x${SELF}'})
+
+        values, errors = self.resolve('FIRST', 'SELF')
+
+        self.assertEqual({}, values)
+        self.assertEqual('circular reference between ${FIRST}, ${SECOND}', str(errors['FIRST']))
+        self.assertEqual('circular reference between ${SELF}', str(errors['SELF']))
+
+    def test_report_cycles_to_dependents(self):
+        self.raws.update({'URL': '${FIRST}', 'FIRST': '${SECOND}', 'SECOND': '${FIRST}'})
+
+        values, errors = self.resolve('URL')
+
+        self.assertEqual('circular reference between ${FIRST}, ${SECOND}', str(errors['URL']))
@@ -16,7 +16,6 @@ declare("undeclared", [your definition here])
 '''
 
 snapshots['ErrorReportingTest::test_report_message_for_missing_environment_variables 1'] = '''Missing environment variables:
-export ERR_KEY_1=[your value here]
 export ERR_KEY_1_DICT2_DICT3_KEY4=[your value here]
 export ERR_KEY_1_DICT2_KEY3=[your value here]
 
@@ -0,0 +1,179 @@
+from concurrent.futures import ThreadPoolExecutor
+from os import environ, getcwd, path, scandir, stat
+from threading import Lock
+
+from .config import _default_file_cache
+
+
+class Source(object):
+
+    def __init__(self, name):
+        """
+        A layer Config reads raw values from.
+
+        Subclasses implement load(). Config passes the names of the environment variables it still needs
+        and merges the returned values of all its sources into one index per load.
+        Variables that are not declared for the current tag are never requested.
+
+        :param name: str the name shown in error reports
+        """
+        super().__init__()
+        self.__name = name
+
+    @property
+    def name(self):
+        return self.__name
+
+    def load(self, keys):
+        """
+        :param keys: set(str) the environment variable names to look up
+        :return: dict raw values of the keys this source has
+        """
+        raise NotImplementedError()
+
+
+class EnvironSource(Source):
+
+    def __init__(self, name='environment'):
+        """
+        The process environment
+
+        :param name: str
+        """
+        super().__init__(name)
+
+    def load(self, keys):
+        return {key: environ[key] for key in keys if key in environ}
+
+
+class FileSource(Source):
+
+    def __init__(self, filename, name=None, required=False, file_cache=None):
+        """
+        The export statements of a bash file
+
+        :param filename: str relative file names are resolved against the working directory on every load
+        :param name: str defaults to the file name
+        :param required: bool raise FileNotFoundError if the file does not exist, otherwise the source is empty
+        :param file_cache: FileCache defaults to the cache shared by all Config instances
+        """
+        super().__init__(name if name is not None else filename)
+        self.__filename = filename
+        self.__required = required
+        self.__file_cache = file_cache if file_cache is not None else _default_file_cache
+
+    @property
+    def filename(self):
+        return self.__filename
+
+    def load(self, keys):
+        try:
+            contents = self.__file_cache.read(path.join(getcwd(), self.__filename))
+        except FileNotFoundError:
+            if self.__required:
+                raise
+            return {}
+        return {key: contents[key] for key in keys if key in contents}
+
+
+class DefaultsSource(Source):
+
+    def __init__(self, values, name='defaults'):
+        """
+        Fixed raw values, usually the last layer
+
+        :param values: dict raw string values by environment variable name
+        :param name: str
+        """
+        super().__init__(name)
+        self.__values = dict(values)
+
+    def load(self, keys):
+        return {key: self.__values[key] for key in keys if key in self.__values}
+
+
+class SecretsDirSource(Source):
+
+    def __init__(self, directory='/run/secrets', name=None, strip=True, max_workers=8, parallel_threshold=16):
+        """
+        A directory with one file per secret, as mounted by docker and kubernetes.
+
+        A variable is read from the file with its name or its lower case name. The directory is listed once per load,
+        only the files of declared variables are read and their contents are cached until their mtime or size change.
+
+        :param directory: str
+        :param name: str defaults to the directory
+        :param strip: bool remove leading and trailing whitespace, including the newline most files end with
+        :param max_workers: int threads reading files concurrently
+        :param parallel_threshold: int read files in a thread pool if at least this many are needed
+        """
+        super().__init__(name if name is not None else directory)
+        self.__directory = directory
+        self.__strip = strip
+        self.__max_workers = max_workers
+        self.__parallel_threshold = parallel_threshold
+        self.__lock = Lock()
+        self.__cache = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def directory(self):
+        return self.__directory
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def load(self, keys):
+        files = self.__list()
+        wanted = {}
+        for key in keys:
+            if key in files:
+                wanted[key] = files[key]
+            elif key.lower() in files:
+                wanted[key] = files[key.lower()]
+        if len(wanted) == 0:
+            return {}
+
+        if len(wanted) >= self.__parallel_threshold and self.__max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+                contents = list(executor.map(self.__read, wanted.values()))
+        else:
+            contents = [self.__read(filename) for filename in wanted.values()]
+        return {key: value for key, value in zip(wanted, contents) if value is not None}
+
+    def __list(self):
+        try:
+            with scandir(self.__directory) as entries:
+                # kubernetes mounts keep the real files in hidden directories like ..data
+                return {entry.name: entry.path for entry in entries if not entry.name.startswith('.')}
+        except FileNotFoundError:
+            return {}
+
+    def __read(self, filename):
+        try:
+            file_stat = stat(filename)
+        except FileNotFoundError:
+            return None
+        signature = (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+        with self.__lock:
+            entry = self.__cache.get(filename)
+            if entry is not None and entry[0] == signature:
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+        try:
+            with open(filename, 'r') as f:
+                value = f.read()
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+        if self.__strip:
+            value = value.strip()
+        with self.__lock:
+            self.__cache[filename] = (signature, value)
+        return value
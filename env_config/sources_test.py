@@ -0,0 +1,214 @@
+import os
+import shutil
+import tempfile
+from os import environ
+from unittest import TestCase
+
+from env_config import Config, DefaultsSource, EnvironSource, FileSource, SecretsDirSource, Source, \
+    AggregateConfigError, ConfigNotInCurrentTagError, ConfigParseError, FileCache, parse_int, parse_str
+
+
+def delete_environment_variable(name):
+    try:
+        del environ[name]
+    except KeyError:
+        pass
+
+
+class RecordingSource(Source):
+    def __init__(self, name, values):
+        super().__init__(name)
+        self.values = values
+        self.requested = []
+
+    def load(self, keys):
+        self.requested.append(set(keys))
+        return {key: self.values[key] for key in keys if key in self.values}
+
+
+class SourcesTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.filenames = []
+        for key in ('SOURCES_FIRST', 'SOURCES_SECOND', 'SOURCES_THIRD'):
+            delete_environment_variable(key)
+
+    def tearDown(self):
+        super().tearDown()
+        for filename in self.filenames:
+            os.remove(filename)
+
+    def write_file(self, contents):
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        with open(filename, 'w') as f:
+            f.write(contents)
+        self.filenames.append(filename)
+        return filename
+
+
+class SourcesTest(SourcesTestCase):
+    def test_first_source_wins(self):
+        environ['SOURCES_FIRST'] = 'environment'
+        override = self.write_file('export SOURCES_FIRST=override\nexport SOURCES_SECOND=override\n')
+        base = self.write_file('export SOURCES_SECOND=base\nexport SOURCES_THIRD=base\n')
+        config = Config(sources=[
+            EnvironSource(),
+            FileSource(override, name='override'),
+            FileSource(base, name='base'),
+            DefaultsSource({'SOURCES_THIRD': 'default', 'SOURCES_FOURTH': 'default'}),
+        ], file_cache=FileCache())
+
+        config.declare('sources', {'first': parse_str(), 'second': parse_str(), 'third': parse_str(),
+                                   'fourth': parse_str()})
+
+        self.assertEqual(
+            {'first': 'environment', 'second': 'override', 'third': 'base', 'fourth': 'default'},
+            config.get('sources')
+        )
+        self.assertEqual({
+            'SOURCES_FIRST': 'environment',
+            'SOURCES_SECOND': 'override',
+            'SOURCES_THIRD': 'base',
+            'SOURCES_FOURTH': 'defaults',
+        }, config.provenance)
+
+    def test_only_ask_lower_sources_for_missing_keys(self):
+        first = RecordingSource('first', {'SOURCES_FIRST': '1'})
+        second = RecordingSource('second', {'SOURCES_SECOND': '2'})
+        config = Config(sources=[first, second])
+
+        config.declare_many({'sources_first': parse_int(), 'sources_second': parse_int()})
+
+        self.assertEqual([{'SOURCES_FIRST', 'SOURCES_SECOND'}], first.requested)
+        self.assertEqual([{'SOURCES_SECOND'}], second.requested)
+
+    def test_sources_are_not_read_for_inactive_variables(self):
+        source = RecordingSource('base', {'SOURCES_FIRST': '1'})
+        config = Config(sources=[source])
+
+        config.declare('sources_first', parse_int(), ('other',), 'default')
+
+        self.assertEqual([], source.requested)
+        with self.assertRaises(ConfigNotInCurrentTagError):
+            config.get('sources_first')
+
+    def test_inactive_variable_missing_from_all_sources(self):
+        config = Config(sources=[DefaultsSource({})])
+
+        config.declare('sources_first', parse_int(), ('other',), 'default')
+
+        with self.assertRaises(ConfigNotInCurrentTagError):
+            config.get('sources_first')
+
+    def test_report_source_of_parse_errors(self):
+        config = Config(sources=[DefaultsSource({'SOURCES_FIRST': 'one'}, name='base')])
+        config.declare('sources_first', parse_int())
+
+        with self.assertRaises(AggregateConfigError) as context:
+            config.get('sources_first')
+
+        error, = [ex for ex in context.exception.exceptions if isinstance(ex, ConfigParseError)]
+        self.assertEqual('base', error.source)
+        self.assertIn('SOURCES_FIRST (from base): ', str(context.exception))
+
+    def test_reload_from_changed_source(self):
+        source = RecordingSource('source', {'SOURCES_FIRST': '1'})
+        config = Config(sources=[EnvironSource(), source])
+        config.declare('sources_first', parse_int())
+
+        environ['SOURCES_FIRST'] = '2'
+        changes = config.reload()
+
+        self.assertEqual(frozenset({'SOURCES_FIRST'}), changes)
+        self.assertEqual(2, config.get('sources_first'))
+        self.assertEqual({'SOURCES_FIRST': 'environment'}, config.provenance)
+
+    def test_missing_file(self):
+        config = Config(sources=[FileSource('missing/file'), DefaultsSource({'SOURCES_FIRST': '1'})])
+        config.declare('sources_first', parse_int())
+
+        self.assertEqual(1, config.get('sources_first'))
+
+    def test_required_file(self):
+        config = Config(sources=[FileSource('missing/file', required=True)])
+
+        with self.assertRaises(FileNotFoundError):
+            config.declare('sources_first', parse_int())
+
+    def test_filename_variable_and_sources_are_exclusive(self):
+        with self.assertRaises(ValueError):
+            Config(filename_variable='CONFIG_FILE', sources=[EnvironSource()])
+
+
+class SecretsDirSourceTest(SourcesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.directory)
+
+    def write_secret(self, name, value):
+        with open(os.path.join(self.directory, name), 'w') as f:
+            f.write(value)
+
+    def test_read_declared_secrets(self):
+        self.write_secret('sources_first', 'secret\n')
+        self.write_secret('SOURCES_SECOND', ' 2 ')
+        self.write_secret('undeclared', 'value')
+        source = SecretsDirSource(self.directory)
+
+        self.assertEqual(
+            {'SOURCES_FIRST': 'secret', 'SOURCES_SECOND': '2'},
+            source.load({'SOURCES_FIRST', 'SOURCES_SECOND', 'SOURCES_THIRD'})
+        )
+        self.assertEqual(2, source.misses)
+
+    def test_keep_whitespace(self):
+        self.write_secret('sources_first', 'secret\n')
+
+        source = SecretsDirSource(self.directory, strip=False)
+
+        self.assertEqual({'SOURCES_FIRST': 'secret\n'}, source.load({'SOURCES_FIRST'}))
+
+    def test_cache_until_file_changes(self):
+        self.write_secret('sources_first', 'secret')
+        source = SecretsDirSource(self.directory)
+        source.load({'SOURCES_FIRST'})
+        source.load({'SOURCES_FIRST'})
+        self.assertEqual(1, source.hits)
+
+        self.write_secret('sources_first', 'new secret')
+
+        self.assertEqual({'SOURCES_FIRST': 'new secret'}, source.load({'SOURCES_FIRST'}))
+        self.assertEqual(2, source.misses)
+
+    def test_read_many_secrets_concurrently(self):
+        keys = {'SOURCES_SECRET_{}'.format(i) for i in range(40)}
+        for key in keys:
+            self.write_secret(key.lower(), key)
+
+        result = SecretsDirSource(self.directory, parallel_threshold=10).load(keys)
+
+        self.assertEqual({key: key for key in keys}, result)
+
+    def test_ignore_hidden_files_and_directories(self):
+        os.mkdir(os.path.join(self.directory, '..data'))
+        os.mkdir(os.path.join(self.directory, 'sources_first'))
+        self.write_secret('.sources_second', 'hidden')
+
+        self.assertEqual({}, SecretsDirSource(self.directory).load({'SOURCES_FIRST', '..DATA', '.SOURCES_SECOND'}))
+
+    def test_missing_directory(self):
+        self.assertEqual({}, SecretsDirSource(os.path.join(self.directory, 'missing')).load({'SOURCES_FIRST'}))
+
+    def test_config(self):
+        self.write_secret('sources_first', '1234\n')
+        config = Config(sources=[EnvironSource(), SecretsDirSource(self.directory, name='secrets')])
+
+        config.declare('sources_first', parse_int())
+
+        self.assertEqual(1234, config.get('sources_first'))
+        self.assertEqual({'SOURCES_FIRST': 'secrets'}, config.provenance)
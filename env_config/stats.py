@@ -0,0 +1,87 @@
+from threading import Lock
+
+
+class ConfigStats(object):
+
+    def __init__(self, callback=None):
+        """
+        Counters and timings recorded by an instrumented Config.
+
+        :param callback: callable called with the event name and a dict of event data for every recorded event.
+                         Events are 'parse', 'file_read' and 'reload'.
+                         File cache hits and misses are counted for this config only, even if the cache is shared.
+        """
+        super().__init__()
+        self.__callback = callback
+        self.__lock = Lock()
+        self.__keys = {}
+        self.__gets = {}
+        self.__environ_lookups = 0
+        self.__file_lookups = 0
+        self.__file_reads = 0
+        self.__file_cache_hits = 0
+        self.__file_cache_misses = 0
+        self.__reloads = 0
+        self.__reload_time = 0.0
+        self.__last_reload_time = None
+
+    def record_lookup(self, found_in_environ, file_searched=True):
+        """
+        :param found_in_environ: bool
+        :param file_searched: bool whether a config file was searched for variables missing from the environment
+        """
+        with self.__lock:
+            self.__environ_lookups += 1
+            if not found_in_environ and file_searched:
+                self.__file_lookups += 1
+
+    def record_parse(self, env_key, parse_time, validate_time):
+        with self.__lock:
+            key_stats = self.__keys.get(env_key)
+            if key_stats is None:
+                key_stats = self.__keys[env_key] = {'parses': 0, 'parse_time': 0.0, 'validate_time': 0.0}
+            key_stats['parses'] += 1
+            key_stats['parse_time'] += parse_time
+            key_stats['validate_time'] += validate_time
+        if self.__callback is not None:
+            self.__callback('parse', {'key': env_key, 'parse_time': parse_time, 'validate_time': validate_time})
+
+    def record_file_read(self, filename, cached=False):
+        with self.__lock:
+            self.__file_reads += 1
+            if cached:
+                self.__file_cache_hits += 1
+            else:
+                self.__file_cache_misses += 1
+        if self.__callback is not None:
+            self.__callback('file_read', {'filename': filename, 'cached': cached})
+
+    def record_reload(self, duration, changes):
+        with self.__lock:
+            self.__reloads += 1
+            self.__reload_time += duration
+            self.__last_reload_time = duration
+        if self.__callback is not None:
+            self.__callback('reload', {'duration': duration, 'changes': changes})
+
+    def record_get(self, key):
+        with self.__lock:
+            self.__gets[key] = self.__gets.get(key, 0) + 1
+
+    def as_dict(self):
+        """
+        :return: dict all recorded counters and timings. Times are in seconds.
+        """
+        with self.__lock:
+            return {
+                'keys': {key: dict(key_stats) for key, key_stats in self.__keys.items()},
+                'gets': dict(self.__gets),
+                'environ_lookups': self.__environ_lookups,
+                'file_lookups': self.__file_lookups,
+                'file_reads': self.__file_reads,
+                'file_cache_hits': self.__file_cache_hits,
+                'file_cache_misses': self.__file_cache_misses,
+                'reloads': self.__reloads,
+                'reload_time': self.__reload_time,
+                'last_reload_time': self.__last_reload_time,
+            }
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from env_config import ConfigStats
+
+
+class ConfigStatsTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.events = []
+        self.stats = ConfigStats(lambda event, data: self.events.append((event, data)))
+
+    def test_empty(self):
+        self.assertEqual({
+            'keys': {},
+            'gets': {},
+            'environ_lookups': 0,
+            'file_lookups': 0,
+            'file_reads': 0,
+            'file_cache_hits': 0,
+            'file_cache_misses': 0,
+            'reloads': 0,
+            'reload_time': 0.0,
+            'last_reload_time': None,
+        }, ConfigStats().as_dict())
+
+    def test_accumulate_parse_times_per_key(self):
+        self.stats.record_parse('KEY', 1.0, 0.5)
+        self.stats.record_parse('KEY', 2.0, 0.25)
+
+        self.assertEqual({'KEY': {'parses': 2, 'parse_time': 3.0, 'validate_time': 0.75}}, self.stats.as_dict()['keys'])
+        self.assertEqual(('parse', {'key': 'KEY', 'parse_time': 2.0, 'validate_time': 0.25}), self.events[-1])
+
+    def test_count_lookups(self):
+        self.stats.record_lookup(True)
+        self.stats.record_lookup(False)
+        self.stats.record_lookup(False, file_searched=False)
+
+        result = self.stats.as_dict()
+        self.assertEqual(3, result['environ_lookups'])
+        self.assertEqual(1, result['file_lookups'])
+
+    def test_count_file_cache_hits(self):
+        self.stats.record_file_read('env', cached=False)
+        self.stats.record_file_read('env', cached=True)
+
+        result = self.stats.as_dict()
+        self.assertEqual(2, result['file_reads'])
+        self.assertEqual(1, result['file_cache_hits'])
+        self.assertEqual(1, result['file_cache_misses'])
+        self.assertEqual(('file_read', {'filename': 'env', 'cached': True}), self.events[-1])
+
+    def test_reloads(self):
+        self.stats.record_reload(1.0, frozenset({'KEY'}))
+        self.stats.record_reload(0.5, frozenset())
+
+        result = self.stats.as_dict()
+        self.assertEqual(2, result['reloads'])
+        self.assertEqual(1.5, result['reload_time'])
+        self.assertEqual(0.5, result['last_reload_time'])
+        self.assertEqual(('reload', {'duration': 0.5, 'changes': frozenset()}), self.events[-1])
+
+    def test_as_dict_is_a_copy(self):
+        self.stats.record_get('KEY')
+        result = self.stats.as_dict()
+        self.stats.record_get('KEY')
+
+        self.assertEqual({'KEY': 1}, result['gets'])
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import tempfile
+from functools import lru_cache, partial
+from os import chmod, path, remove, replace
+from threading import Lock
+
+_VERSION = 1
+
+
+@lru_cache(maxsize=1024)
+def _code_identity(code):
+    consts = [_code_identity(const) if hasattr(const, 'co_code') else repr(const) for const in code.co_consts]
+    description = json.dumps([code.co_code.hex(), consts, list(code.co_names)])
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+
+def _callable_identity(func, seen=()):
+    """
+    describe a parser or validator so that its description changes when its code changes.
+    Objects without a stable repr make the description differ in every process, which only disables caching.
+    """
+    if func is None:
+        return None
+    if id(func) in seen:
+        return 'recursion'
+    seen = seen + (id(func),)
+    if isinstance(func, partial):
+        return [_callable_identity(func.func, seen), repr(func.args), repr(sorted(func.keywords.items()))]
+    name = '{}.{}'.format(getattr(func, '__module__', None), getattr(func, '__qualname__', type(func).__qualname__))
+    code = getattr(func, '__code__', None)
+    if code is None:
+        wrapped = getattr(func, '__wrapped__', None)
+        return name if wrapped is None else _callable_identity(wrapped, seen)
+    closure = [_cell_identity(cell, seen) for cell in func.__closure__ or ()]
+    return [name, _code_identity(code), repr(func.__defaults__), closure]
+
+
+def _cell_identity(cell, seen):
+    try:
+        contents = cell.cell_contents
+    except ValueError:
+        # the variable is not assigned yet
+        return None
+    # decorated validators keep the function they wrap in their closure
+    return _callable_identity(contents, seen) if callable(contents) else repr(contents)
+
+
+def fingerprint(plan, current_tag, raws):
+    """
+    hash everything the value of a plan depends on
+    :param plan: Plan
+    :param current_tag: str
+    :param raws: list(str) the raw value of each entry of the plan
+    :return: str
+    """
+    description = [_VERSION, plan.key, sorted(plan.tags), current_tag, raws]
+    for entry in plan.entries:
+        description.append([
+            entry.env_key,
+            list(entry.path),
+            _callable_identity(entry.parser),
+            _callable_identity(entry.validator),
+            repr(entry.default),
+            entry.separator,
+        ])
+    return hashlib.sha256(json.dumps(description).encode('utf-8')).hexdigest()
+
+
+class WarmCache(object):
+
+    def __init__(self, filename):
+        """
+        On-disk cache of parsed and validated values, so a process start with unchanged inputs skips parsing and
+        validation.
+
+        Values are stored per declared key together with a fingerprint of the definition and the raw values.
+        A key is parsed again as soon as its fingerprint changes. Only JSON compatible values are cached.
+        The file is readable by its owner only, it contains the values in plain text.
+
+        :param filename: str
+        """
+        super().__init__()
+        self.__filename = filename
+        self.__lock = Lock()
+        self.__entries = None
+        self.__dirty = False
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def filename(self):
+        return self.__filename
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def get(self, key, key_fingerprint):
+        """
+        :param key: str
+        :param key_fingerprint: str
+        :return: list the cached value of each entry of the plan or None
+        """
+        with self.__lock:
+            entry = self.__load().get(key)
+            if entry is not None and entry['fingerprint'] == key_fingerprint:
+                self.__hits += 1
+                return entry['values']
+            self.__misses += 1
+            return None
+
+    def put(self, key, key_fingerprint, values):
+        """
+        :param key: str
+        :param key_fingerprint: str
+        :param values: list the value of each entry of the plan
+        :return: bool whether the values could be cached
+        """
+        try:
+            if json.loads(json.dumps(values)) != values:
+                return False
+        except (TypeError, ValueError):
+            return False
+        with self.__lock:
+            self.__load()[key] = {'fingerprint': key_fingerprint, 'values': values}
+            self.__dirty = True
+        return True
+
+    def save(self):
+        """
+        write the cache if it changed. The file is replaced atomically.
+        :return: None
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            contents = json.dumps({'version': _VERSION, 'entries': self.__entries})
+            directory = path.dirname(path.abspath(self.__filename))
+            fd, temp_filename = tempfile.mkstemp(dir=directory, prefix='.env_config_cache')
+            try:
+                with open(fd, 'w') as f:
+                    f.write(contents)
+                chmod(temp_filename, 0o600)
+                replace(temp_filename, self.__filename)
+            except BaseException:
+                remove(temp_filename)
+                raise
+            self.__dirty = False
+
+    def clear(self):
+        with self.__lock:
+            self.__entries = {}
+            self.__dirty = True
+
+    def __load(self):
+        if self.__entries is None:
+            try:
+                with open(self.__filename, 'r') as f:
+                    contents = json.load(f)
+                self.__entries = contents['entries'] if contents.get('version') == _VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                self.__entries = {}
+        return self.__entries
@@ -0,0 +1,115 @@
+import os
+import shutil
+import stat
+import tempfile
+from os import environ
+from unittest import TestCase
+
+from env_config import Config, ValidatorCache, WarmCache, parse_int, parse_str, parse_int_list
+
+
+class WarmCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'cache.json')
+        self.validated = []
+        environ['WARM_FIRST'] = '1'
+        environ['WARM_SECOND'] = 'value'
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.directory)
+        for key in ('WARM_FIRST', 'WARM_SECOND', 'WARM_LIST'):
+            environ.pop(key, None)
+
+    def validator(self, value):
+        self.validated.append(value)
+
+    def start(self, definitions=None):
+        if definitions is None:
+            definitions = {'warm': {'first': parse_int(validator=self.validator), 'second': parse_str()}}
+        warm_cache = WarmCache(self.filename)
+        return Config.from_schema(definitions, warm_cache=warm_cache), warm_cache
+
+    def test_skip_parsing_when_inputs_did_not_change(self):
+        self.start()
+        config, warm_cache = self.start()
+
+        self.assertEqual([1], self.validated)
+        self.assertEqual({'first': 1, 'second': 'value'}, config.get('warm'))
+        self.assertEqual(1, warm_cache.hits)
+
+    def test_parse_again_when_a_raw_value_changes(self):
+        self.start()
+        environ['WARM_SECOND'] = 'new value'
+        config, warm_cache = self.start()
+
+        self.assertEqual([1, 1], self.validated)
+        self.assertEqual({'first': 1, 'second': 'new value'}, config.get('warm'))
+        self.assertEqual(1, warm_cache.misses)
+
+    def test_parse_again_when_the_definition_changes(self):
+        self.start()
+        config, warm_cache = self.start({'warm': {'first': parse_int(validator=lambda x: x), 'second': parse_str()}})
+
+        self.assertEqual(0, warm_cache.hits)
+
+    def test_reload_reports_changes_of_cached_values(self):
+        self.start()
+        config, warm_cache = self.start()
+        environ['WARM_FIRST'] = '2'
+
+        self.assertEqual(frozenset({'WARM_FIRST'}), config.reload())
+        self.assertEqual({'first': 2, 'second': 'value'}, config.get('warm'))
+
+    def test_do_not_cache_errors(self):
+        environ['WARM_FIRST'] = 'one'
+        self.start()
+        environ['WARM_FIRST'] = '1'
+        config, warm_cache = self.start()
+
+        self.assertEqual(1, config.get('warm')['first'])
+        self.assertEqual(0, warm_cache.hits)
+
+    def test_do_not_cache_values_that_do_not_survive_json(self):
+        definitions = {'warm_list': parse_int_list(default=(1, 2))}
+        self.start(definitions)
+        config, warm_cache = self.start(definitions)
+
+        self.assertEqual((1, 2), config.get('warm_list'))
+        self.assertEqual(0, warm_cache.hits)
+
+    def test_write_file_atomically_for_owner_only(self):
+        self.start()
+
+        self.assertEqual(['cache.json'], os.listdir(self.directory))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.filename).st_mode))
+
+    def test_ignore_corrupt_file(self):
+        with open(self.filename, 'w') as f:
+            f.write('{"version": 1, "entr')
+
+        config, warm_cache = self.start()
+
+        self.assertEqual(1, config.get('warm')['first'])
+        self.assertEqual(1, warm_cache.misses)
+
+    def test_clear(self):
+        self.start()
+        warm_cache = WarmCache(self.filename)
+        warm_cache.clear()
+        warm_cache.save()
+
+        config, warm_cache = self.start()
+
+        self.assertEqual(0, warm_cache.hits)
+
+    def test_memoized_validators_keep_their_fingerprint(self):
+        definitions = {'warm': {'first': parse_int(validator=self.validator), 'second': parse_str()}}
+        Config.from_schema(definitions, warm_cache=WarmCache(self.filename))
+        warm_cache = WarmCache(self.filename)
+
+        Config.from_schema(definitions, warm_cache=warm_cache, validator_cache=ValidatorCache())
+
+        self.assertEqual(1, warm_cache.hits)
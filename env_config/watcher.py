@@ -0,0 +1,158 @@
+from os import path, stat
+from threading import Event, Thread
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+
+def _signature(filename):
+    try:
+        file_stat = stat(filename)
+    except FileNotFoundError:
+        return None
+    return file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+
+class _StatPoller(object):
+    def __init__(self, filename):
+        super().__init__()
+        self.__filename = filename
+        self.__signature = _signature(filename)
+
+    def poll(self, timeout, stopped):
+        if stopped.wait(timeout):
+            return False
+        signature = _signature(self.__filename)
+        changed = signature != self.__signature
+        self.__signature = signature
+        return changed
+
+    def close(self):
+        pass
+
+
+class _InotifyPoller(object):
+    def __init__(self, filename):
+        super().__init__()
+        self.__filename = filename
+        self.__name = path.basename(filename)
+        self.__signature = _signature(filename)
+        self.__inotify = INotify()
+        self.__watches = {}
+        self.__watch_directories()
+
+    def poll(self, timeout, stopped):
+        events = self.__inotify.read(timeout=int(timeout * 1000))
+        if stopped.is_set() or len(events) == 0:
+            return False
+        self.__watch_directories()
+        # renames of a symlink in the path, like the ..data link of kubernetes config maps, only show as a new stat
+        signature = _signature(self.__filename)
+        changed = signature != self.__signature or any(event.name == self.__name for event in events)
+        self.__signature = signature
+        return changed
+
+    def __watch_directories(self):
+        # editors and deployment tools often replace the file by renaming a new one over it, so directories are
+        # watched. The directory of the configured path sees renames of the file and of symlinks next to it,
+        # the directory of the current link target sees writes to the file the link points to.
+        directories = {path.dirname(self.__filename), path.dirname(path.realpath(self.__filename))}
+        for directory in set(self.__watches).difference(directories):
+            try:
+                self.__inotify.rm_watch(self.__watches.pop(directory))
+            except OSError:
+                # the watch of a deleted directory is already gone
+                pass
+        for directory in directories.difference(self.__watches):
+            try:
+                self.__watches[directory] = self.__inotify.add_watch(
+                    directory,
+                    flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.CREATE | flags.DELETE
+                )
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        self.__inotify.close()
+
+
+BACKENDS = ('auto', 'poll', 'inotify')
+
+
+class FileWatcher(Thread):
+
+    def __init__(self, config, filename, interval=1.0, debounce=0.2, backend='auto', on_reload=None):
+        """
+        Reload a Config in the background whenever its config file changes
+
+        :param config: Config the config to reload
+        :param filename: str the file to watch
+        :param interval: float seconds between checks for changes
+        :param debounce: float seconds the file has to stay unchanged before reloading
+        :param backend: str 'poll' to check the file's stat, 'inotify' to use inotify_simple,
+                        'auto' to use inotify when it is installed
+        :param on_reload: callable called with the changes returned by Config.reload()
+        """
+        super().__init__(name='env_config.FileWatcher', daemon=True)
+        if backend not in BACKENDS:
+            raise ValueError('unknown backend "{}", allowed values are "{}"'.format(backend, '","'.join(BACKENDS)))
+        if backend == 'inotify' and INotify is None:
+            raise ImportError('the inotify backend requires the inotify_simple package')
+        if backend == 'auto':
+            backend = 'poll' if INotify is None else 'inotify'
+
+        self.__config = config
+        # symlinks are not resolved, they may be re-pointed while the file is watched
+        self.__filename = path.abspath(filename)
+        self.__interval = interval
+        self.__debounce = debounce
+        self.__backend = backend
+        self.__on_reload = on_reload
+        self.__stopped = Event()
+        self.__poller = _InotifyPoller(self.__filename) if backend == 'inotify' else _StatPoller(self.__filename)
+
+    @property
+    def filename(self):
+        return self.__filename
+
+    @property
+    def backend(self):
+        return self.__backend
+
+    def run(self):
+        try:
+            while not self.__stopped.is_set():
+                if not self.__poller.poll(self.__interval, self.__stopped):
+                    continue
+                # wait for a burst of writes to settle before reloading
+                while self.__poller.poll(self.__debounce, self.__stopped):
+                    pass
+                if self.__stopped.is_set():
+                    break
+                self.__reload()
+        finally:
+            self.__poller.close()
+
+    def stop(self, timeout=None):
+        """
+        stop watching and wait for the watcher thread to finish
+        :param timeout: float
+        :return: None
+        """
+        self.__stopped.set()
+        if self.is_alive():
+            self.join(timeout)
+        else:
+            self.__poller.close()
+
+    def __reload(self):
+        try:
+            changes = self.__config.reload()
+            if self.__on_reload is not None:
+                self.__on_reload(changes)
+        except BaseException:
+            self.__config.logger.exception(
+                'Reloading config failed. {{"filename": "{0}"}}'.format(self.__filename)
+            )
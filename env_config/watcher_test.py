@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+from os import environ
+from threading import Event
+from time import sleep
+from unittest import TestCase, skipIf
+
+from env_config import Config, ConfigError, FileCache, FileWatcher, parse_int
+from env_config.watcher import INotify
+
+
+class FileWatcherTests(object):
+    backend = None
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'env')
+        self.write_file('export WATCHED_VARIABLE=1\n')
+        environ['WATCHED_CONFIG_FILE'] = self.filename
+        self.config = Config(filename_variable='WATCHED_CONFIG_FILE', file_cache=FileCache())
+        self.config.declare('watched_variable', parse_int())
+        self.reloaded = Event()
+        self.changes = []
+        self.watcher = None
+
+    def tearDown(self):
+        super().tearDown()
+        if self.watcher is not None:
+            self.watcher.stop()
+        shutil.rmtree(self.directory)
+        del environ['WATCHED_CONFIG_FILE']
+
+    def write_file(self, contents):
+        with open(self.filename, 'w') as f:
+            f.write(contents)
+
+    def on_reload(self, changes):
+        self.changes.append(changes)
+        self.reloaded.set()
+
+    def watch(self, debounce=0.01):
+        self.watcher = self.config.watch_file(
+            interval=0.01, debounce=debounce, backend=self.backend, on_reload=self.on_reload)
+
+    def test_reload_when_file_changes(self):
+        self.watch()
+        self.write_file('export WATCHED_VARIABLE=12\n')
+
+        self.assertTrue(self.reloaded.wait(5))
+        self.assertEqual(12, self.config.get('watched_variable'))
+        self.assertEqual([frozenset(['WATCHED_VARIABLE'])], self.changes)
+
+    def test_reload_when_file_is_replaced(self):
+        self.watch()
+        replacement = os.path.join(self.directory, 'env.new')
+        with open(replacement, 'w') as f:
+            f.write('export WATCHED_VARIABLE=13\n')
+        os.rename(replacement, self.filename)
+
+        self.assertTrue(self.reloaded.wait(5))
+        self.assertEqual(13, self.config.get('watched_variable'))
+
+    def publish(self, version, contents):
+        """
+        update a file the way kubernetes updates config maps: env -> ..data/env, ..data -> ..<version>
+        """
+        os.mkdir(os.path.join(self.directory, version))
+        with open(os.path.join(self.directory, version, 'env'), 'w') as f:
+            f.write(contents)
+        link = os.path.join(self.directory, '..data_tmp')
+        os.symlink(version, link)
+        os.rename(link, os.path.join(self.directory, '..data'))
+
+    def test_reload_when_symlinked_file_is_swapped(self):
+        self.publish('..1', 'export WATCHED_VARIABLE=20\n')
+        linked = os.path.join(self.directory, 'linked')
+        os.symlink(os.path.join('..data', 'env'), linked)
+        environ['WATCHED_CONFIG_FILE'] = linked
+        self.config = Config(filename_variable='WATCHED_CONFIG_FILE', file_cache=FileCache())
+        self.config.declare('watched_variable', parse_int())
+        self.watch()
+
+        for version, value in (('..2', 21), ('..3', 22)):
+            self.reloaded.clear()
+            self.publish(version, 'export WATCHED_VARIABLE={}\n'.format(value))
+
+            self.assertTrue(self.reloaded.wait(5))
+            self.assertEqual(value, self.config.get('watched_variable'))
+
+    def test_debounce_bursts_of_writes(self):
+        self.watch(debounce=0.3)
+        for i in range(5):
+            self.write_file('export WATCHED_VARIABLE={}\n'.format(100 + i))
+            sleep(0.02)
+
+        self.assertTrue(self.reloaded.wait(5))
+        sleep(0.4)
+        self.assertEqual(1, len(self.changes))
+        self.assertEqual(104, self.config.get('watched_variable'))
+
+    def test_stop(self):
+        self.watch()
+        self.watcher.stop()
+        self.write_file('export WATCHED_VARIABLE=12\n')
+
+        self.assertFalse(self.reloaded.wait(0.2))
+        self.assertFalse(self.watcher.is_alive())
+
+
+class StatPollingFileWatcherTest(FileWatcherTests, TestCase):
+    backend = 'poll'
+
+
+@skipIf(INotify is None, 'inotify_simple is not installed')
+class InotifyFileWatcherTest(FileWatcherTests, TestCase):
+    backend = 'inotify'
+
+
+class FileWatcherTest(TestCase):
+    def test_raise_when_filename_variable_is_not_set(self):
+        config = Config(filename_variable='MISSING_CONFIG_FILE')
+        with self.assertRaises(ConfigError):
+            config.watch_file()
+
+    def test_raise_on_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            FileWatcher(Config(), __file__, backend='unknown')